@@ -0,0 +1,172 @@
+"""Shared factory for Google API clients.
+
+Building a client means parsing the API's discovery document and turning
+the user's stored credentials into a Credentials object, which is slow
+enough to matter when it happens on every call. Here the discovery
+documents bundled with google-api-python-client are parsed once per
+process, and each user's credentials and services are kept in small LRU
+caches, so a client is only built again when the user's stored
+credentials change or it is evicted.
+
+httplib2 connections are not thread-safe, so a service is cached per
+thread; the credentials behind it are shared, and refreshed at most once
+per expiry across all of a user's services.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import cache as memoize
+
+import google.oauth2.credentials
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+from accounts.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+# the APIs in use, and their versions
+APIS = {
+    "calendar": "v3",
+    "people": "v1",
+}
+
+# how many users' credentials, and services, are kept per process
+MAX_CREDENTIALS = 256
+MAX_SERVICES = 256
+
+_lock = threading.Lock()
+_credentials = OrderedDict()
+_services = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "build_seconds": 0.0}
+
+
+@memoize
+def discovery_document(api):
+    """Parse an API's bundled discovery document once per process."""
+    return json.loads(get_static_doc(api, APIS[api]))
+
+
+def _remember(lru, key, value, size):
+    lru[key] = value
+    lru.move_to_end(key)
+    while len(lru) > size:
+        lru.popitem(last=False)
+
+
+def _lookup(lru, key, stored):
+    entry = lru.get(key)
+    if entry is None or entry[0] != stored:
+        return None
+    lru.move_to_end(key)
+    return entry[1]
+
+
+def get_credentials(user):
+    """Get a user's Google credentials, refreshing them if they've expired.
+
+    Args:
+        user (CustomUser): a user who has connected a Google account
+
+    Returns:
+        credentials (Credentials): the user's credentials, or None if the
+            user hasn't connected a Google account
+
+    Notes:
+        A refreshed access token is saved back to the user, so other
+        processes pick it up instead of refreshing again.
+
+    """
+    stored = user.google_credentials
+    if not stored:
+        return None
+
+    with _lock:
+        credentials = _lookup(_credentials, user.id, stored)
+        if credentials is None:
+            credentials = (
+                google.oauth2.credentials.Credentials.from_authorized_user_info(
+                    json.loads(stored)
+                )
+            )
+
+        if not credentials.valid and credentials.refresh_token:
+            credentials.refresh(Request())
+            stored = credentials.to_json()
+            user.google_credentials = stored
+            CustomUser.objects.filter(pk=user.id).update(google_credentials=stored)
+
+        _remember(_credentials, user.id, (stored, credentials), MAX_CREDENTIALS)
+
+    return credentials
+
+
+def get_service(user, api):
+    """Get a Google API service for a user.
+
+    Args:
+        user (CustomUser): a user who has connected a Google account
+        api (str): the API, "calendar" or "people"
+
+    Returns:
+        service (Resource): the service, or False if the user
+            hasn't connected a Google account
+
+    """
+    credentials = get_credentials(user)
+    if credentials is None:
+        return False
+
+    key = (user.id, api, threading.get_ident())
+    with _lock:
+        service = _lookup(_services, key, credentials)
+        if service is not None:
+            _stats["hits"] += 1
+            return service
+
+    start = time.perf_counter()
+    service = build_from_document(discovery_document(api), credentials=credentials)
+    elapsed = time.perf_counter() - start
+
+    with _lock:
+        _stats["misses"] += 1
+        _stats["build_seconds"] += elapsed
+        _remember(_services, key, (credentials, service), MAX_SERVICES)
+
+    logger.debug(f"Built {api} service for user {user.id} in {elapsed:.3f}s")
+    return service
+
+
+def forget(user_id):
+    """Drop a user's cached credentials and services, e.g. on logout."""
+    with _lock:
+        _credentials.pop(user_id, None)
+        for key in [key for key in _services if key[0] == user_id]:
+            del _services[key]
+
+
+def stats():
+    """Report how often a cached service was reused, and the time saved.
+
+    Returns:
+        stats (dict): hits, misses, build_seconds spent on misses, and
+            seconds_saved, estimated from the average build time
+
+    """
+    with _lock:
+        hits, misses, build_seconds = (
+            _stats["hits"],
+            _stats["misses"],
+            _stats["build_seconds"],
+        )
+    average = build_seconds / misses if misses else 0.0
+    return {
+        "hits": hits,
+        "misses": misses,
+        "build_seconds": build_seconds,
+        "seconds_saved": hits * average,
+    }
@@ -0,0 +1,120 @@
+import json
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from apps.common import google_api
+
+pytestmark = pytest.mark.django_db
+
+
+def credentials_json(token="t1", expiry=None):
+    expiry = expiry or datetime.utcnow() + timedelta(hours=1)
+    return json.dumps(
+        {
+            "token": token,
+            "refresh_token": "r",
+            "client_id": "c",
+            "client_secret": "s",
+            "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    google_api._credentials.clear()
+    google_api._services.clear()
+    google_api._stats.update(hits=0, misses=0, build_seconds=0.0)
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    builds = []
+
+    def build_from_document(document, credentials):
+        builds.append(credentials)
+        return object()
+
+    monkeypatch.setattr(google_api, "build_from_document", build_from_document)
+    return builds
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        "ollie", "ollie@example.com", "x", google_credentials=credentials_json()
+    )
+
+
+def test_service_is_built_once(user, builds):
+    first = google_api.get_service(user, "calendar")
+    second = google_api.get_service(user, "calendar")
+    google_api.get_service(user, "people")
+
+    assert first is second
+    assert len(builds) == 2
+    stats = google_api.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_new_credentials_rebuild_the_service(user, builds):
+    first = google_api.get_service(user, "calendar")
+    user.google_credentials = credentials_json(token="t2")
+
+    second = google_api.get_service(user, "calendar")
+
+    assert first is not second
+    assert builds[1].token == "t2"
+
+
+def test_each_thread_gets_its_own_service(user, builds):
+    services = [google_api.get_service(user, "calendar")]
+    thread = threading.Thread(
+        target=lambda: services.append(google_api.get_service(user, "calendar"))
+    )
+    thread.start()
+    thread.join()
+
+    assert services[0] is not services[1]
+    # both are built on the same credentials
+    assert builds[0] is builds[1]
+
+
+def test_expired_credentials_are_refreshed_and_saved(user, builds, monkeypatch):
+    user.google_credentials = credentials_json(
+        expiry=datetime.utcnow() - timedelta(minutes=5)
+    )
+    refreshes = []
+
+    def refresh(credentials, request):
+        refreshes.append(credentials)
+        credentials.token = "fresh"
+        credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    monkeypatch.setattr(
+        google_api.google.oauth2.credentials.Credentials, "refresh", refresh
+    )
+
+    google_api.get_service(user, "calendar")
+    google_api.get_service(user, "people")
+
+    assert len(refreshes) == 1
+    user.refresh_from_db()
+    assert json.loads(user.google_credentials)["token"] == "fresh"
+
+
+def test_user_without_credentials(django_user_model, builds):
+    user = django_user_model.objects.create_user("nemo", "nemo@example.com", "x")
+    assert google_api.get_service(user, "calendar") is False
+    assert builds == []
+
+
+def test_forget_drops_cached_clients(user, builds):
+    google_api.get_service(user, "calendar")
+    google_api.forget(user.id)
+    google_api.get_service(user, "calendar")
+
+    assert len(builds) == 2
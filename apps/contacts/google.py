@@ -1,118 +1,289 @@
-import json
+"""Sync contacts with the user's Google account.
 
-import google.oauth2.credentials
-from apiclient.discovery import build
-from django.shortcuts import get_object_or_404
+Views don't call Google themselves. They queue changes as
+GoogleContactChange rows, which "flush" sends to the People API in batches
+of up to BATCH_SIZE contacts per call. A flush runs in the background
+after each change, and from the sync_google_contacts command, which picks
+up anything a background flush missed.
+"""
 
-from accounts.models import CustomUser
+import logging
+import threading
 
+from django.core.cache import cache
+from django.db import connection, transaction
 
-def build_service(contact):
-    """Create an instance of the Google API service.
+from apps.common import google_api
+from apps.contacts.models import Contact, GoogleContactChange
+
+logger = logging.getLogger(__name__)
+
+# contacts per People API batch call
+BATCH_SIZE = 200
+
+# the contact fields kept in sync
+PERSON_FIELDS = "names,emailAddresses,phoneNumbers"
+
+# how long a flush may hold the lock before another worker may try
+FLUSH_LOCK_TIMEOUT = 300
+
+
+def build_service(user):
+    """Get an instance of the Google People API service.
 
     Args:
-        contact (Contact): an instance of the Contact model
+        user (CustomUser): the user whose Google account to use
 
     Returns:
-        service (??): a Google service object of some kind
-
-    Notes:
-        A contact is passed into this function to identify the
-        user associated with that contact.  Then, with that information,
-        the function can locate the user's Google credentials. Then the function
-        has the information it needs to build the Google service object
+        service (Resource): the People service, or False if the user
+            hasn't connected a Google account
 
     """
 
-    user = get_object_or_404(CustomUser, pk=contact.user.id)
-    credentials = user.google_credentials
-
-    if credentials:
-        credentials = json.loads(credentials)
-        credentials = google.oauth2.credentials.Credentials.from_authorized_user_info(
-            credentials
-        )
-        service = build("people", "v1", credentials=credentials)
-        return service
-    else:
-        return False
+    return google_api.get_service(user, "people")
 
 
-def add_contact(contact):
-    """Add a contact to the user's Google account.
+def person(contact):
+    """Describe a contact as a People API person.
 
     Args:
         contact (Contact): an instance of the Contact model
 
     Returns:
-        google_id (str): a unique identifier associated with the Google contact
-
-    Notes:
-        Attempts to add a user's contact to their Google account. If successful, returns
-        the unique identifier associated with the Google contact that was added.
-        If unsuccessful, returns false.
+        person (dict): the contact's name, email and phone numbers
 
     """
+    phones = [
+        (contact.phone1, contact.phone1_label),
+        (contact.phone2, contact.phone2_label),
+        (contact.phone3, contact.phone3_label),
+    ]
+    return {
+        "names": [{"unstructuredName": contact.name}],
+        "emailAddresses": [{"value": contact.email}] if contact.email else [],
+        "phoneNumbers": [
+            {"value": value, "type": label} for value, label in phones if value
+        ],
+    }
 
-    service = build_service(contact)
-
-    if service:
-        new_contact = {
-            "names": [{"unstructuredName": contact.name}],
-            "emailAddresses": [{"value": contact.email}],
-            "phoneNumbers": [
-                {
-                    "value": contact.phone1,
-                    "type": contact.phone1_label,
-                },
-                {
-                    "value": contact.phone2,
-                    "type": contact.phone2_label,
-                },
-                {
-                    "value": contact.phone3,
-                    "type": contact.phone3_label,
-                },
-            ],
-        }
 
-        result = service.people().createContact(body=new_contact).execute()
+def _chunks(items):
+    for start in range(0, len(items), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        yield items[start:end]
 
-        if result:
-            google_id = result["resourceName"]
-            return google_id
-        else:
-            return False
 
-    else:
-        return False
+def queue_create(user, contacts):
+    """Queue contacts to be added to the user's Google account.
 
+    Args:
+        user (CustomUser): the contacts' owner
+        contacts (list): Contact instances; any already synced are skipped
 
-def delete_contact(contact):
-    """Delete a contact from the user's Google account.
+    """
+    contacts = [contact for contact in contacts if not contact.google_sync]
+    for contact in contacts:
+        contact.google_sync = True
+
+    Contact.objects.filter(id__in=[contact.id for contact in contacts]).update(
+        google_sync=True
+    )
+    GoogleContactChange.objects.bulk_create(
+        [
+            GoogleContactChange(user=user, contact=contact, action="create")
+            for contact in contacts
+        ]
+    )
+    schedule_flush(user)
+
+
+def queue_update(user, contacts):
+    """Queue synced contacts' new details to be sent to Google.
 
     Args:
-        contact (Contact): the contact to be deleted
+        user (CustomUser): the contacts' owner
+        contacts (list): Contact instances; any not synced are skipped
+
+    """
+    GoogleContactChange.objects.bulk_create(
+        [
+            GoogleContactChange(user=user, contact=contact, action="update")
+            for contact in contacts
+            if contact.google_sync
+        ]
+    )
+    schedule_flush(user)
 
-    Returns:
-        True/False
+
+def queue_delete(user, contacts):
+    """Queue contacts to be removed from the user's Google account.
+
+    Args:
+        user (CustomUser): the contacts' owner
+        contacts (list): Contact instances
 
     Notes:
-        Attempts to delete a user's contact from their Google account.
-        If successful, returns True, otherwise returns False.
+        The Google identifier is copied into the queue, so a contact
+        can be deleted here before the change is sent.
 
     """
-    service = build_service(contact)
+    GoogleContactChange.objects.bulk_create(
+        [
+            GoogleContactChange(
+                user=user, contact=contact, action="delete", google_id=contact.google_id
+            )
+            for contact in contacts
+            if contact.google_id
+        ]
+    )
+
+    for contact in contacts:
+        contact.google_sync = False
+        contact.google_id = ""
+    Contact.objects.filter(id__in=[contact.id for contact in contacts]).update(
+        google_sync=False, google_id=""
+    )
+    schedule_flush(user)
+
+
+def _delete(service, changes):
+    for batch in _chunks(changes):
+        service.people().batchDeleteContacts(
+            body={"resourceNames": [change.google_id for change in batch]}
+        ).execute()
+        GoogleContactChange.objects.filter(
+            id__in=[change.id for change in batch]
+        ).delete()
 
-    if service:
+
+def _create(service, contacts):
+    for batch in _chunks(contacts):
         result = (
-            service.people().deleteContact(resourceName=contact.google_id).execute()
+            service.people()
+            .batchCreateContacts(
+                body={
+                    "contacts": [{"contactPerson": person(c)} for c in batch],
+                    "readMask": "names",
+                }
+            )
+            .execute()
         )
+        # created people come back in the order they were sent
+        for contact, created in zip(batch, result.get("createdPeople", [])):
+            if "person" in created:
+                contact.google_id = created["person"]["resourceName"]
+        Contact.objects.bulk_update(batch, ["google_id"])
+
+
+def _update(service, contacts):
+    for batch in _chunks(contacts):
+        # an update has to name the version of each person it replaces
+        result = (
+            service.people()
+            .getBatchGet(
+                resourceNames=[contact.google_id for contact in batch],
+                personFields="metadata",
+            )
+            .execute()
+        )
+        etags = {
+            response["person"]["resourceName"]: response["person"]["etag"]
+            for response in result.get("responses", [])
+            if "person" in response
+        }
+
+        people = {
+            contact.google_id: person(contact) | {"etag": etags[contact.google_id]}
+            for contact in batch
+            if contact.google_id in etags
+        }
+        if people:
+            service.people().batchUpdateContacts(
+                body={
+                    "contacts": people,
+                    "updateMask": PERSON_FIELDS,
+                    "readMask": "names",
+                }
+            ).execute()
+
+
+def flush(user):
+    """Send a user's queued contact changes to Google.
+
+    Args:
+        user (CustomUser): the user whose changes to send
+
+    Notes:
+        Deletes go first, then creates, then updates. Creates and updates
+        are sent with each contact's details as they are now, so several
+        queued changes to one contact cost a single entry in a batch.
+
+    """
+    changes = list(GoogleContactChange.objects.filter(user=user).order_by("id"))
+    if not changes:
+        return
+
+    service = build_service(user)
+    if not service:
+        # the user has disconnected Google, so there's nowhere to send them
+        GoogleContactChange.objects.filter(
+            id__in=[change.id for change in changes]
+        ).delete()
+        return
+
+    _delete(service, [change for change in changes if change.action == "delete"])
+
+    changes = [change for change in changes if change.action != "delete"]
+    contacts = Contact.objects.filter(
+        id__in={change.contact_id for change in changes}, google_sync=True
+    ).order_by("id")
+    updated_ids = {change.contact_id for change in changes if change.action == "update"}
+
+    # a contact created now is sent with its latest details, so needs no update
+    to_create = [contact for contact in contacts if not contact.google_id]
+    to_update = [
+        contact
+        for contact in contacts
+        if contact.google_id and contact.id in updated_ids
+    ]
+    _create(service, to_create)
+    _update(service, to_update)
+
+    GoogleContactChange.objects.filter(
+        id__in=[change.id for change in changes]
+    ).delete()
+
+
+def _flush_lock_key(user_id):
+    return f"contacts:{user_id}:google-flush"
+
+
+def _flush_in_background(user):
+    try:
+        flush(user)
+    except Exception as e:
+        logger.warning(f"Failed to sync Google contacts for user {user.id}: {e}")
+    finally:
+        cache.delete(_flush_lock_key(user.id))
+        connection.close()
+
+
+def run_in_background(function, *args):
+    """Run a flush without holding up the request."""
+    threading.Thread(target=function, args=args, daemon=True).start()
+
+
+def schedule_flush(user):
+    """Flush the user's changes in the background once the transaction commits.
+
+    Notes:
+        While a flush is running, another isn't started; changes queued in
+        the meantime are sent by the next flush or the sync command.
+
+    """
 
-        if result:
-            return True
-        else:
-            return False
+    def start():
+        if cache.add(_flush_lock_key(user.id), True, FLUSH_LOCK_TIMEOUT):
+            run_in_background(_flush_in_background, user)
 
-    else:
-        return False
+    transaction.on_commit(start)
@@ -0,0 +1,34 @@
+"""
+Send queued contact changes to Google for every user who has some.
+
+Run every 5 minutes via cron:
+    */5 * * * * cd /home/james/mh && /home/james/.venvs/mh/bin/python manage.py sync_google_contacts
+"""
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import CustomUser
+from apps.contacts.google import flush
+
+
+class Command(BaseCommand):
+    help = "Send queued contact changes to Google"
+
+    def handle(self, *args, **options):
+        synced_count = 0
+        error_count = 0
+
+        users = CustomUser.objects.filter(googlecontactchange__isnull=False).distinct()
+        for user in users:
+            try:
+                flush(user)
+                synced_count += 1
+            except Exception as e:
+                self.stderr.write(f"Failed to sync contacts for {user.username}: {e}")
+                error_count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced contacts for {synced_count} user(s), {error_count} error(s)"
+            )
+        )
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_synced_contacts(apps, schema_editor):
+    Contact = apps.get_model("contacts", "Contact")
+    Contact.objects.exclude(google_id__isnull=True).exclude(google_id="").update(
+        google_sync=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contacts", "0006_contact_created_at_contact_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contact",
+            name="google_sync",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_synced_contacts, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="GoogleContactChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("create", "Create"),
+                            ("update", "Update"),
+                            ("delete", "Delete"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("google_id", models.CharField(blank=True, default="", max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "contact",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="contacts.contact",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "app_contact_google_change",
+            },
+        ),
+    ]
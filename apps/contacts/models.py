@@ -27,6 +27,8 @@ class Contact(TimestampMixin, models.Model):
         map (str): a url to google maps for the contact's address
         notes (str): comments about the contact
         google_id (str): if added to a Google account, the unique identifier for that Google contact
+        google_sync (bool): whether the contact should be in the user's Google account;
+            set straight away, while google_id follows once the change is synced
         fillable (list): a list of the above attributes that are fillable by a form
     """
 
@@ -48,6 +50,7 @@ class Contact(TimestampMixin, models.Model):
     map = models.CharField(max_length=255, blank=True, null=True)
     notes = models.CharField(max_length=255, blank=True, null=True)
     google_id = models.CharField(max_length=255, blank=True, null=True)
+    google_sync = models.BooleanField(default=False)
 
     fillable = [
         "folder_id",
@@ -71,3 +74,35 @@ class Contact(TimestampMixin, models.Model):
 
     class Meta:
         db_table = "app_contact"
+
+
+class GoogleContactChange(models.Model):
+    """A change to a contact waiting to be sent to Google.
+
+    Attributes:
+        user (int): the user whose Google account the change is for
+        contact (int): the changed contact; None once the contact is deleted
+        action (str): 'create', 'update' or 'delete'
+        google_id (str): for a delete, the Google contact to remove
+        created_at (datetime): when the change was queued
+    """
+
+    ACTION_CHOICES = [
+        ("create", "Create"),
+        ("update", "Update"),
+        ("delete", "Delete"),
+    ]
+
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    contact = models.ForeignKey(
+        Contact, on_delete=models.SET_NULL, blank=True, null=True
+    )
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    google_id = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.action} : {self.contact_id or self.google_id}"
+
+    class Meta:
+        db_table = "app_contact_google_change"
@@ -0,0 +1,137 @@
+import pytest
+from django.core.management import call_command
+
+import apps.contacts.google as google
+from apps.contacts.models import Contact, GoogleContactChange
+
+pytestmark = pytest.mark.django_db
+
+
+class People:
+    """A fake People API service that records each batch call."""
+
+    def __init__(self):
+        self.calls = []
+        self.created = 0
+
+    def people(self):
+        return self
+
+    def _call(self, method, result):
+        self.calls.append(method)
+        return Request(result)
+
+    def batchCreateContacts(self, body):
+        people = []
+        for _ in body["contacts"]:
+            self.created += 1
+            people.append({"person": {"resourceName": f"people/c{self.created}"}})
+        self.last_body = body
+        return self._call("batchCreateContacts", {"createdPeople": people})
+
+    def batchDeleteContacts(self, body):
+        self.last_body = body
+        return self._call("batchDeleteContacts", {})
+
+    def getBatchGet(self, resourceNames, personFields):
+        responses = [
+            {"person": {"resourceName": name, "etag": f"etag-{name}"}}
+            for name in resourceNames
+        ]
+        return self._call("getBatchGet", {"responses": responses})
+
+    def batchUpdateContacts(self, body):
+        self.last_body = body
+        return self._call("batchUpdateContacts", {})
+
+
+class Request:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return self.result
+
+
+@pytest.fixture
+def people(monkeypatch):
+    people = People()
+    monkeypatch.setattr(google, "build_service", lambda user: people)
+    # flush explicitly in the tests rather than in a thread
+    monkeypatch.setattr(google, "schedule_flush", lambda user: None)
+    return people
+
+
+@pytest.fixture
+def many_contacts(user, folder1):
+    return Contact.objects.bulk_create(
+        [Contact(user=user, folder=folder1, name=f"Contact {i}") for i in range(450)]
+    )
+
+
+def test_folder_toggle_batches_creates(client, user, folder1, many_contacts, people):
+    response = client.post(f"/contacts/folder/{folder1.id}/google-toggle-htmx")
+    assert response.status_code == 204
+    assert Contact.objects.filter(google_sync=True).count() == 450
+
+    google.flush(user)
+
+    assert people.calls == ["batchCreateContacts"] * 3
+    assert not Contact.objects.filter(google_id__isnull=True).exists()
+    assert not GoogleContactChange.objects.exists()
+
+
+def test_folder_toggle_removes_synced_folder(
+    client, user, folder1, many_contacts, people
+):
+    client.post(f"/contacts/folder/{folder1.id}/google-toggle-htmx")
+    google.flush(user)
+    people.calls.clear()
+
+    client.post(f"/contacts/folder/{folder1.id}/google-toggle-htmx")
+    google.flush(user)
+
+    assert people.calls == ["batchDeleteContacts"] * 3
+    assert not Contact.objects.filter(google_sync=True).exists()
+    assert not Contact.objects.exclude(google_id="").exists()
+
+
+def test_queued_changes_coalesce(user, contact, people):
+    google.queue_create(user, [contact])
+    google.queue_update(user, [contact])
+    google.queue_update(user, [contact])
+
+    google.flush(user)
+
+    assert people.calls == ["batchCreateContacts"]
+    assert len(people.last_body["contacts"]) == 1
+
+
+def test_update_sends_etags(user, contact, people):
+    google.queue_create(user, [contact])
+    google.flush(user)
+    contact.refresh_from_db()
+
+    contact.name = "M. K. Gandhi"
+    contact.save()
+    google.queue_update(user, [contact])
+    google.flush(user)
+
+    assert people.calls[1:] == ["getBatchGet", "batchUpdateContacts"]
+    person = people.last_body["contacts"][contact.google_id]
+    assert person["etag"] == f"etag-{contact.google_id}"
+    assert person["names"] == [{"unstructuredName": "M. K. Gandhi"}]
+
+
+def test_deleted_contact_is_removed_from_google(client, user, contact, people):
+    google.queue_create(user, [contact])
+    google.flush(user)
+    contact.refresh_from_db()
+    google_id = contact.google_id
+
+    client.delete(f"/contacts/{contact.id}/delete-htmx")
+    call_command("sync_google_contacts")
+
+    assert people.calls[-1] == "batchDeleteContacts"
+    assert people.last_body == {"resourceNames": [google_id]}
+    assert not GoogleContactChange.objects.exists()
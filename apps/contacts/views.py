@@ -9,6 +9,7 @@ import apps.contacts.google as google
 from apps.contacts.forms import ContactForm
 from apps.contacts.models import Contact
 from apps.folders.folders import get_folders_for_page, select_folder
+from apps.folders.models import Folder
 from apps.management.pagination import CustomPaginator
 
 
@@ -188,12 +189,11 @@ def edit(request, id):
             contact = form.save(commit=False)
             contact.user = user
 
-            if user.google_credentials and contact.google_id:
-                google.delete_contact(contact)
-                contact.google_id = google.add_contact(contact)
-
             contact.save()
 
+            if user.google_credentials and contact.google_sync:
+                google.queue_update(user, [contact])
+
             return redirect("contacts")
 
     else:
@@ -232,32 +232,30 @@ def delete(request, id):
     except ObjectDoesNotExist:
         raise Http404("Record not found.")
     if contact.google_id:
-        google.delete_contact(contact)
+        google.queue_delete(request.user, [contact])
     contact.delete()
     return redirect("contacts")
 
 
 @login_required
 def google_toggle(request, id):
-    """Add a contact to Google account, update the contact with its google_id.
+    """Add a contact to, or remove it from, the user's Google account.
 
     Args:
         id (int): a Contact instance id
 
     Notes:
-        Invoked by a link under the contact,
-        which is displayed if the contact does not have a google_id.
+        Invoked by a link under the contact. The change is queued and
+        sent to Google in the background, which records the google_id.
 
     """
 
-    contact = get_object_or_404(Contact, pk=id)
-    if contact.google_id:
-        google.delete_contact(contact)
-        contact.google_id = ""
+    contact = get_object_or_404(Contact, pk=id, user=request.user)
+    if contact.google_sync:
+        google.queue_delete(request.user, [contact])
     else:
-        contact.google_id = google.add_contact(contact)
+        google.queue_create(request.user, [contact])
 
-    contact.save()
     return redirect("contacts")
 
 
@@ -333,10 +331,8 @@ def contacts_form_htmx(request, id=None):
             saved_contact.save()
 
             # Handle Google sync for edits
-            if contact and user.google_credentials and saved_contact.google_id:
-                google.delete_contact(saved_contact)
-                saved_contact.google_id = google.add_contact(saved_contact)
-                saved_contact.save()
+            if contact and user.google_credentials and saved_contact.google_sync:
+                google.queue_update(user, [saved_contact])
 
             # Select the saved contact and switch to its folder
             user.contacts_contact = saved_contact.id
@@ -385,7 +381,7 @@ def delete_htmx(request, id):
         raise Http404("Record not found.")
 
     if contact.google_id:
-        google.delete_contact(contact)
+        google.queue_delete(user, [contact])
     contact.delete()
 
     # Clear selected contact
@@ -408,13 +404,39 @@ def google_toggle_htmx(request, id):
     user = request.user
     contact = get_object_or_404(Contact, pk=id, user=user)
 
-    if contact.google_id:
-        google.delete_contact(contact)
-        contact.google_id = ""
+    if contact.google_sync:
+        google.queue_delete(user, [contact])
     else:
-        contact.google_id = google.add_contact(contact)
+        google.queue_create(user, [contact])
 
-    contact.save()
+    return HttpResponse(
+        status=204,
+        headers={
+            "HX-Trigger": json.dumps(
+                {"contactsChanged": "", "contactDetailChanged": ""}
+            )
+        },
+    )
+
+
+@login_required
+def google_folder_toggle_htmx(request, id):
+    """Toggle Google sync for every contact in a folder via htmx.
+
+    Notes:
+        If any of the folder's contacts aren't synced, they are all added;
+        otherwise they are all removed. Either way the changes go to
+        Google in a few batch calls.
+
+    """
+    user = request.user
+    folder = get_object_or_404(Folder, pk=id, user=user, page="contacts")
+    contacts = list(Contact.objects.filter(user=user, folder=folder))
+
+    if all(contact.google_sync for contact in contacts):
+        google.queue_delete(user, contacts)
+    else:
+        google.queue_create(user, contacts)
 
     return HttpResponse(
         status=204,
@@ -12,6 +12,7 @@ from apps.favorites.forms import FavoriteExtensionForm, FavoriteForm
 from apps.favorites.models import Favorite
 from apps.folders.folders import get_folders_for_page, select_folder
 from apps.folders.models import Folder
+from apps.home.cache import expire, folder_user_ids
 from apps.management.pagination import CustomPaginator
 
 FAVORITES_ALLOWED_ORDER_FIELDS = {"name", "created_at", "updated_at"}
@@ -359,7 +360,13 @@ def bulk_move_folder(request):
     data = json.loads(request.body)
     ids = data.get("favorite_ids", [])
     folder_id = data.get("folder_id")
-    Favorite.objects.filter(user=request.user, id__in=ids).update(folder_id=folder_id)
+    favorites = Favorite.objects.filter(user=request.user, id__in=ids)
+
+    # update() skips the signals that expire the home page cache
+    folder_ids = set(favorites.values_list("folder_id", flat=True))
+    folder_ids.add(folder_id)
+    favorites.update(folder_id=folder_id)
+    expire(folder_user_ids(folder_ids) | {request.user.id}, ["favorites"])
     return HttpResponse(status=204, headers={"HX-Trigger": "favoritesChanged"})
 
 
@@ -1,7 +1,11 @@
 import requests
+from django.conf import settings
 from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
 
-from django.conf import settings
+from apps.finance import market_cache
+
+# seconds allowed for a quote request
+REQUEST_TIMEOUT = 10
 
 
 def collect(symbols):
@@ -23,7 +27,7 @@ def collect(symbols):
     }
 
     try:
-        response = requests.get(url, params=params)
+        response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
         result = response.json()["data"]
 
     except (ConnectionError, Timeout, TooManyRedirects):
@@ -32,6 +36,32 @@ def collect(symbols):
     return result
 
 
+def fetch_many(symbols):
+    """Fetch the data for a list of crypto symbols in one call.
+
+    Args:
+        symbols (list): crypto symbols, e.g. ["BTC", "ETH"]
+
+    Returns:
+        result (dict): symbol to asset data, for the symbols that were found
+
+    """
+    return collect(",".join(symbols)) or {}
+
+
+def collect_cached(symbols):
+    """Get the data for a list of crypto symbols through the shared quote cache.
+
+    Args:
+        symbols (list): crypto symbols, e.g. ["BTC", "ETH"]
+
+    Returns:
+        result (dict): symbol to asset data, in the shape returned by "collect"
+
+    """
+    return market_cache.get_quotes("crypto", symbols, fetch_many)
+
+
 def condense(data):
     """Extract the most relevant data into a smaller dict.
 
@@ -0,0 +1,43 @@
+"""
+Refresh the saved quote snapshots for every actively tracked symbol.
+
+Run every 5 minutes via cron:
+    */5 * * * * cd /home/james/mh && /home/james/.venvs/mh/bin/python manage.py refresh_quotes
+
+Or keep it running, refreshing every 60 seconds:
+    python manage.py refresh_quotes --interval 60
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.finance import snapshots
+
+
+class Command(BaseCommand):
+    help = "Refresh the saved quote snapshots for the finance pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running, refreshing every INTERVAL seconds",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+
+        while True:
+            for kind in snapshots.FETCHERS:
+                symbols, quotes = snapshots.refresh(kind)
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Refreshed {len(quotes)} of {len(symbols)} {kind} quote(s)"
+                    )
+                )
+
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,137 @@
+"""Shared cache of market quotes, keyed by symbol.
+
+Quotes are stored in Django's cache, so every user and every worker tracking
+a symbol shares one upstream call per MARKET_DATA_TTL window. Once a quote is
+older than the TTL it is still served for up to MARKET_DATA_STALE_TTL more
+seconds while a single background refresh fetches a new one.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# how long a refresh may hold the lock before another worker may try
+REFRESH_LOCK_TIMEOUT = 30
+
+
+def _quote_key(kind, symbol):
+    return f"market:{kind}:{symbol}"
+
+
+def _lock_key(kind, symbol):
+    return f"market:{kind}:{symbol}:refresh"
+
+
+def _ttl():
+    return settings.MARKET_DATA_TTL
+
+
+def _stale_ttl():
+    return settings.MARKET_DATA_STALE_TTL
+
+
+def store_quotes(kind, quotes):
+    """Write freshly fetched quotes to the cache.
+
+    Args:
+        kind (str): the type of asset, "crypto" or "securities"
+        quotes (dict): symbol to quote data
+
+    """
+    fetched_at = time.time()
+    cache.set_many(
+        {
+            _quote_key(kind, symbol): {"quote": quote, "fetched_at": fetched_at}
+            for symbol, quote in quotes.items()
+        },
+        _ttl() + _stale_ttl(),
+    )
+
+
+def refresh(kind, symbols, fetch):
+    """Fetch quotes from the upstream service and cache them.
+
+    Args:
+        kind (str): the type of asset, "crypto" or "securities"
+        symbols (list): the symbols to fetch
+        fetch (callable): takes a list of symbols, returns a dict of
+            symbol to quote, leaving out any symbol it could not fetch
+
+    Returns:
+        quotes (dict): symbol to quote, for the symbols that were fetched
+
+    """
+    try:
+        quotes = fetch(symbols)
+    except Exception as e:
+        logger.warning(f"Failed to fetch {kind} quotes for {symbols}: {e}")
+        quotes = {}
+
+    store_quotes(kind, quotes)
+    return quotes
+
+
+def _revalidate(kind, symbols, fetch):
+    try:
+        refresh(kind, symbols, fetch)
+    finally:
+        cache.delete_many([_lock_key(kind, symbol) for symbol in symbols])
+
+
+def run_in_background(function, *args):
+    """Run a stale quote refresh without holding up the request."""
+    threading.Thread(target=function, args=args, daemon=True).start()
+
+
+def get_quotes(kind, symbols, fetch):
+    """Get quotes for a list of symbols, calling upstream only when needed.
+
+    Args:
+        kind (str): the type of asset, "crypto" or "securities"
+        symbols (list): the symbols to look up
+        fetch (callable): takes a list of symbols, returns a dict of
+            symbol to quote, leaving out any symbol it could not fetch
+
+    Returns:
+        quotes (dict): symbol to quote, for every symbol that has one
+
+    Notes:
+        Symbols with no cached quote are fetched in one call to fetch.
+        Stale quotes are returned as they are, and refreshed in the
+        background by whichever request first claims the refresh lock.
+
+    """
+    keys = {_quote_key(kind, symbol): symbol for symbol in symbols}
+    found = cache.get_many(keys)
+
+    now = time.time()
+    quotes = {}
+    missing = []
+    stale = []
+    for key, symbol in keys.items():
+        entry = found.get(key)
+        if entry is None:
+            missing.append(symbol)
+            continue
+        quotes[symbol] = entry["quote"]
+        if now - entry["fetched_at"] >= _ttl():
+            stale.append(symbol)
+
+    if missing:
+        quotes.update(refresh(kind, missing, fetch))
+
+    # only one request per symbol gets to refresh it
+    stale = [
+        symbol
+        for symbol in stale
+        if cache.add(_lock_key(kind, symbol), True, REFRESH_LOCK_TIMEOUT)
+    ]
+    if stale:
+        run_in_background(_revalidate, kind, stale, fetch)
+
+    return quotes
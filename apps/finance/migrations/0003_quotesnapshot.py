@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0002_alter_cryptosymbol_created_at_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuoteSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_index=True, default=django.utils.timezone.now
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("crypto", "Crypto"), ("securities", "Securities")],
+                        max_length=20,
+                    ),
+                ),
+                ("symbol", models.CharField(max_length=20)),
+                ("data", models.JSONField()),
+            ],
+            options={
+                "db_table": "finance_quote_snapshot",
+                "unique_together": {("kind", "symbol")},
+            },
+        ),
+    ]
@@ -66,3 +66,30 @@ class SecuritiesSymbol(TimestampMixin, models.Model):
 
     def __str__(self):
         return f"{self.symbol} ({self.user.username})"
+
+
+class QuoteSnapshot(TimestampMixin, models.Model):
+    """The latest quote for a symbol, written by the refresh_quotes command.
+
+    Attributes:
+        kind (str): The type of asset, 'crypto' or 'securities'
+        symbol (str): The asset's symbol (e.g., 'BTC', 'TSLA')
+        data (dict): The quote as returned by the upstream service
+        updated_at (datetime): When the quote was last refreshed
+    """
+
+    KIND_CHOICES = [
+        ("crypto", "Crypto"),
+        ("securities", "Securities"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    symbol = models.CharField(max_length=20)
+    data = models.JSONField()
+
+    class Meta:
+        db_table = "finance_quote_snapshot"
+        unique_together = ["kind", "symbol"]
+
+    def __str__(self):
+        return f"{self.symbol} ({self.kind})"
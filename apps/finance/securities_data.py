@@ -1,6 +1,14 @@
-import requests
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
 
+import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from apps.finance import market_cache
+
+logger = logging.getLogger(__name__)
 
 asset_list = [
     {
@@ -51,7 +59,35 @@ asset_list = [
 ]
 
 
-def fetch(symbol):
+QUOTE_URL = "https://finnhub.io/api/v1/quote"
+
+# at most this many quote requests are in flight at once
+FETCH_WORKERS = 8
+
+# seconds allowed for a single quote request
+REQUEST_TIMEOUT = 5
+
+# seconds allowed for a whole batch of quotes, after which
+# the symbols still outstanding are left out
+FETCH_DEADLINE = 8
+
+QUOTE_FIELDS = {
+    "previous_close": "pc",
+    "open": "o",
+    "high": "h",
+    "low": "l",
+    "price": "c",
+    "change": "d",
+    "percent_change": "dp",
+}
+
+# one connection pool shared by every request in the process
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_WORKERS))
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_WORKERS))
+
+
+def fetch(symbol, timeout=REQUEST_TIMEOUT):
     """Fetch securities data for a specific symbol/asset.
 
     Returns:
@@ -59,36 +95,90 @@ def fetch(symbol):
 
     """
 
-    url = "https://finnhub.io/api/v1/quote"
     params = {
         "symbol": symbol,
         "token": settings.FINNHUB_API_KEY,
     }
-    response = requests.get(url, params=params)
+    response = session.get(QUOTE_URL, params=params, timeout=timeout)
     quote = response.json()
     return quote
 
 
-def collect(assets):
+def fetch_many(symbols, timeout=REQUEST_TIMEOUT, deadline=FETCH_DEADLINE):
+    """Fetch securities data for a list of symbols concurrently.
+
+    Args:
+        symbols (list): the symbols to fetch
+        timeout (float): seconds allowed for each request
+        deadline (float): seconds allowed for the whole batch
+
+    Returns:
+        quotes (dict): symbol to quote, as returned by "fetch"
+
+    Notes:
+        Symbols whose request fails or is still running at the deadline
+        are left out, so one slow symbol costs a single row, not the page.
+
+    """
+    if not symbols:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(symbols)))
+    futures = {executor.submit(fetch, symbol, timeout): symbol for symbol in symbols}
+    done, not_done = wait(futures, timeout=deadline)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    quotes = {}
+    for future in done:
+        symbol = futures[future]
+        try:
+            quotes[symbol] = future.result()
+        except (RequestException, ValueError) as e:
+            logger.warning(f"Failed to fetch quote for {symbol}: {e}")
+
+    for future in not_done:
+        logger.warning(f"Quote for {futures[future]} missed the {deadline}s deadline")
+
+    return quotes
+
+
+def collect_cached(symbols):
+    """Get quotes for a list of symbols through the shared quote cache.
+
+    Args:
+        symbols (list): the symbols to look up
+
+    Returns:
+        quotes (dict): symbol to quote, as returned by "fetch"
+
+    """
+    return market_cache.get_quotes("securities", symbols, fetch_many)
+
+
+def collect(assets, quotes=None):
     """Fetch securities data for a COLLECTION of symbols/assets.
 
+    Args:
+        assets (list): dicts with the symbol, name and exchange of each asset
+        quotes (dict): symbol to quote, e.g. from the saved snapshots;
+            looked up with "collect_cached" when not given
+
     Returns:
         assets (list): a list of assets with the dict of attributes for each
 
     Notes:
-        Uses the "fetch" function, above to pull the data for each asset
+        An asset whose quote could not be fetched has its attributes
+        set to None.
 
     """
 
+    if quotes is None:
+        quotes = collect_cached([asset["symbol"] for asset in assets])
+
     for asset in assets:
-        quote = fetch(asset["symbol"])
-        asset["previous_close"] = quote["pc"]
-        asset["open"] = quote["o"]
-        asset["high"] = quote["h"]
-        asset["low"] = quote["l"]
-        asset["price"] = quote["c"]
-        asset["change"] = quote["d"]
-        asset["percent_change"] = quote["dp"]
+        quote = quotes.get(asset["symbol"], {})
+        for field, key in QUOTE_FIELDS.items():
+            asset[field] = quote.get(key)
     return assets
 
 
@@ -108,5 +198,9 @@ def sort(data, ord):
         reverse = True
     else:
         reverse = False
-    sorted_data = sorted(data, key=lambda k: k[ord], reverse=reverse)
-    return sorted_data
+
+    # assets without a quote go last whichever way the list is sorted
+    available = [asset for asset in data if asset[ord] is not None]
+    unavailable = [asset for asset in data if asset[ord] is None]
+    sorted_data = sorted(available, key=lambda k: k[ord], reverse=reverse)
+    return sorted_data + unavailable
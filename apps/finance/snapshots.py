@@ -0,0 +1,138 @@
+"""Quote snapshots, refreshed in the background and read by the finance pages."""
+
+from django.utils import timezone
+
+import apps.finance.crypto_data as crypto_data
+import apps.finance.securities_data as securities_data
+from apps.finance.models import CryptoSymbol, QuoteSnapshot, SecuritiesSymbol
+
+# symbols per CoinMarketCap request
+CRYPTO_BATCH_SIZE = 100
+
+
+def fetch_crypto(symbols):
+    """Fetch crypto quotes in batches of comma-separated symbols.
+
+    Args:
+        symbols (list): crypto symbols
+
+    Returns:
+        quotes (dict): symbol to asset data, for the symbols that were found
+
+    Notes:
+        CoinMarketCap rejects a whole request if one symbol is invalid,
+        so a batch that returns nothing is split in half and retried,
+        isolating a bad symbol in a handful of extra calls.
+
+    """
+    quotes = {}
+    for start in range(0, len(symbols), CRYPTO_BATCH_SIZE):
+        end = start + CRYPTO_BATCH_SIZE
+        quotes.update(_fetch_crypto_batch(symbols[start:end]))
+    return quotes
+
+
+def _fetch_crypto_batch(symbols):
+    quotes = crypto_data.fetch_many(symbols)
+    if quotes or len(symbols) == 1:
+        return quotes
+
+    middle = len(symbols) // 2
+    quotes = _fetch_crypto_batch(symbols[:middle])
+    quotes.update(_fetch_crypto_batch(symbols[middle:]))
+    return quotes
+
+
+FETCHERS = {
+    "crypto": fetch_crypto,
+    "securities": securities_data.fetch_many,
+}
+
+SYMBOL_MODELS = {
+    "crypto": CryptoSymbol,
+    "securities": SecuritiesSymbol,
+}
+
+
+def active_symbols(kind):
+    """Get every symbol any user is actively tracking.
+
+    Args:
+        kind (str): the type of asset, "crypto" or "securities"
+
+    Returns:
+        symbols (list): distinct symbols, sorted
+
+    """
+    symbols = (
+        SYMBOL_MODELS[kind]
+        .objects.filter(is_active=True)
+        .values_list("symbol", flat=True)
+        .distinct()
+        .order_by("symbol")
+    )
+    return list(symbols)
+
+
+def refresh(kind):
+    """Fetch quotes for all active symbols of a kind and save the snapshots.
+
+    Args:
+        kind (str): the type of asset, "crypto" or "securities"
+
+    Returns:
+        symbols (list): the symbols that were requested
+        quotes (dict): symbol to quote, for the symbols that were fetched
+
+    """
+    symbols = active_symbols(kind)
+    quotes = FETCHERS[kind](symbols) if symbols else {}
+
+    now = timezone.now()
+    QuoteSnapshot.objects.bulk_create(
+        [
+            QuoteSnapshot(kind=kind, symbol=symbol, data=quote, updated_at=now)
+            for symbol, quote in quotes.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["kind", "symbol"],
+        update_fields=["data", "updated_at"],
+    )
+
+    return symbols, quotes
+
+
+def get_quotes(kind, symbols):
+    """Get quotes for a user's symbols from the saved snapshots.
+
+    Args:
+        kind (str): the type of asset, "crypto" or "securities"
+        symbols (list): the symbols to look up
+
+    Returns:
+        quotes (dict): symbol to quote
+        last_updated (datetime): when the oldest of the quotes was
+            refreshed, or None if there are none
+
+    Notes:
+        A symbol that has no snapshot yet, e.g. one just added in settings,
+        is looked up through the shared quote cache until the next refresh.
+
+    """
+    snapshots = QuoteSnapshot.objects.filter(kind=kind, symbol__in=symbols)
+
+    quotes = {}
+    last_updated = None
+    for snapshot in snapshots:
+        quotes[snapshot.symbol] = snapshot.data
+        if last_updated is None or snapshot.updated_at < last_updated:
+            last_updated = snapshot.updated_at
+
+    missing = [symbol for symbol in symbols if symbol not in quotes]
+    if missing:
+        if kind == "crypto":
+            quotes.update(crypto_data.collect_cached(missing))
+        else:
+            quotes.update(securities_data.collect_cached(missing))
+
+    return quotes, last_updated
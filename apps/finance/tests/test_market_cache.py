@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import cache
+
+from apps.finance import market_cache
+
+
+class Upstream:
+    """A fake quote service that records each call."""
+
+    def __init__(self):
+        self.calls = []
+        self.price = 100
+
+    def __call__(self, symbols):
+        self.calls.append(list(symbols))
+        return {symbol: {"c": self.price} for symbol in symbols}
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(market_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(autouse=True)
+def setup(settings, monkeypatch):
+    settings.MARKET_DATA_TTL = 60
+    settings.MARKET_DATA_STALE_TTL = 600
+    cache.clear()
+    # run refreshes inline so their effect can be checked
+    monkeypatch.setattr(
+        market_cache, "run_in_background", lambda function, *args: function(*args)
+    )
+
+
+def test_missing_symbols_are_fetched_in_one_call(upstream, clock):
+    quotes = market_cache.get_quotes("securities", ["TSLA", "GME"], upstream)
+    assert quotes == {"TSLA": {"c": 100}, "GME": {"c": 100}}
+    assert upstream.calls == [["TSLA", "GME"]]
+
+
+def test_quotes_are_shared_within_the_ttl(upstream, clock):
+    for _ in range(100):
+        market_cache.get_quotes("securities", ["TSLA"], upstream)
+    assert upstream.calls == [["TSLA"]]
+
+    market_cache.get_quotes("securities", ["TSLA", "GME"], upstream)
+    assert upstream.calls == [["TSLA"], ["GME"]]
+
+
+def test_stale_quotes_are_served_while_revalidating(upstream, clock, monkeypatch):
+    market_cache.get_quotes("securities", ["TSLA"], upstream)
+
+    background = []
+    monkeypatch.setattr(
+        market_cache, "run_in_background", lambda *args: background.append(args)
+    )
+    upstream.price = 200
+    clock[0] += 61
+
+    quotes = market_cache.get_quotes("securities", ["TSLA"], upstream)
+    assert quotes["TSLA"]["c"] == 100
+    assert len(background) == 1
+
+    # a second request while the refresh is running doesn't start another
+    market_cache.get_quotes("securities", ["TSLA"], upstream)
+    assert len(background) == 1
+
+    function, *args = background[0]
+    function(*args)
+    quotes = market_cache.get_quotes("securities", ["TSLA"], upstream)
+    assert quotes["TSLA"]["c"] == 200
+    assert upstream.calls == [["TSLA"], ["TSLA"]]
+
+
+def test_upstream_failure_leaves_symbol_out(clock):
+    def broken(symbols):
+        raise ConnectionError("unreachable")
+
+    assert market_cache.get_quotes("crypto", ["BTC"], broken) == {}
+
+
+def test_kinds_are_kept_apart(upstream, clock):
+    market_cache.get_quotes("securities", ["O"], upstream)
+    market_cache.get_quotes("crypto", ["O"], upstream)
+    assert upstream.calls == [["O"], ["O"]]
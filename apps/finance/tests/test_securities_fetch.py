@@ -0,0 +1,95 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import apps.finance.securities_data as securities_data
+
+# seconds the stub server takes to answer for each symbol
+LATENCY = {f"SYM{i}": 0.2 for i in range(10)}
+LATENCY["SLOW"] = 3
+
+
+class QuoteHandler(BaseHTTPRequestHandler):
+    """Answer like Finnhub's quote endpoint, after a per-symbol delay."""
+
+    def do_GET(self):
+        symbol = parse_qs(urlparse(self.path).query)["symbol"][0]
+        time.sleep(LATENCY.get(symbol, 0))
+        body = json.dumps(
+            {"c": 10, "d": 1, "dp": 10, "h": 11, "l": 9, "o": 9.5, "pc": 9, "t": 0}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QuoteHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/v1/quote"
+    monkeypatch.setattr(securities_data, "QUOTE_URL", url)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_benchmark_concurrent_fetch(stub_server):
+    symbols = [f"SYM{i}" for i in range(10)]
+
+    start = time.perf_counter()
+    for symbol in symbols:
+        securities_data.fetch(symbol)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    quotes = securities_data.fetch_many(symbols)
+    concurrent = time.perf_counter() - start
+
+    print(f"sequential: {sequential:.2f}s, concurrent: {concurrent:.2f}s")
+    assert set(quotes) == set(symbols)
+    assert concurrent < sequential / 3
+
+
+def test_slow_symbol_misses_deadline(stub_server):
+    symbols = ["SYM0", "SYM1", "SLOW"]
+
+    start = time.perf_counter()
+    quotes = securities_data.fetch_many(symbols, timeout=1, deadline=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert set(quotes) == {"SYM0", "SYM1"}
+    assert elapsed < 1
+
+
+def test_request_timeout_drops_symbol(stub_server):
+    quotes = securities_data.fetch_many(["SYM0", "SLOW"], timeout=0.5, deadline=5)
+    assert set(quotes) == {"SYM0"}
+
+
+def test_missing_quote_degrades_one_row(monkeypatch):
+    monkeypatch.setattr(
+        securities_data.market_cache,
+        "get_quotes",
+        lambda kind, symbols, fetch: {"TSLA": {"c": 5, "pc": 4}},
+    )
+    assets = [
+        {"symbol": "TSLA", "name": "Tesla", "exchange": "NASDAQ"},
+        {"symbol": "SLOW", "name": "Slow", "exchange": "NYSE"},
+    ]
+    data = securities_data.collect(assets)
+    assert data[0]["price"] == 5
+    assert data[1]["price"] is None
+
+    sorted_data = securities_data.sort(data, "price")
+    assert [asset["symbol"] for asset in sorted_data] == ["TSLA", "SLOW"]
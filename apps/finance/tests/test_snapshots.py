@@ -0,0 +1,122 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+import apps.finance.crypto_data as crypto_data
+import apps.finance.securities_data as securities_data
+from apps.finance import snapshots
+from apps.finance.models import CryptoSymbol, QuoteSnapshot, SecuritiesSymbol
+
+pytestmark = pytest.mark.django_db
+
+
+class Upstream:
+    """A fake quote service that records each call."""
+
+    def __init__(self, quotes):
+        self.calls = []
+        self.quotes = quotes
+
+    def __call__(self, symbols):
+        self.calls.append(list(symbols))
+        return {s: self.quotes[s] for s in symbols if s in self.quotes}
+
+
+@pytest.fixture
+def upstream(monkeypatch, sample_crypto_data):
+    cache.clear()
+    crypto = Upstream(sample_crypto_data)
+    securities = Upstream({"TSLA": {"c": 5, "d": 1, "dp": 25, "pc": 4}})
+    monkeypatch.setattr(crypto_data, "fetch_many", crypto)
+    monkeypatch.setattr(securities_data, "fetch_many", securities)
+    monkeypatch.setitem(snapshots.FETCHERS, "securities", securities)
+    return crypto, securities
+
+
+@pytest.fixture
+def symbols(user, django_user_model):
+    other = django_user_model.objects.create_user("paul", "paul@example.com", "x")
+    for owner in (user, other):
+        CryptoSymbol.objects.create(user=owner, symbol="BTC", name="Bitcoin")
+        SecuritiesSymbol.objects.create(
+            user=owner, symbol="TSLA", name="Tesla", exchange="NASDAQ"
+        )
+    CryptoSymbol.objects.create(user=other, symbol="ETH", name="Ethereum")
+    CryptoSymbol.objects.create(
+        user=other, symbol="DOGE", name="Dogecoin", is_active=False
+    )
+
+
+def test_refresh_fetches_each_symbol_once(upstream, symbols):
+    crypto, securities = upstream
+    call_command("refresh_quotes")
+
+    assert crypto.calls == [["BTC", "ETH"]]
+    assert securities.calls == [["TSLA"]]
+    assert set(QuoteSnapshot.objects.values_list("kind", "symbol")) == {
+        ("crypto", "BTC"),
+        ("crypto", "ETH"),
+        ("securities", "TSLA"),
+    }
+
+
+def test_refresh_updates_snapshots_in_place(upstream, symbols):
+    crypto, securities = upstream
+    call_command("refresh_quotes")
+    first = QuoteSnapshot.objects.get(kind="securities", symbol="TSLA").updated_at
+
+    securities.quotes["TSLA"]["c"] = 6
+    call_command("refresh_quotes")
+
+    snapshot = QuoteSnapshot.objects.get(kind="securities", symbol="TSLA")
+    assert snapshot.data["c"] == 6
+    assert snapshot.updated_at > first
+    assert QuoteSnapshot.objects.count() == 3
+
+
+def test_bad_crypto_symbol_is_isolated(upstream, symbols, user, monkeypatch):
+    crypto, securities = upstream
+    CryptoSymbol.objects.create(user=user, symbol="NOPE", name="Nope")
+
+    # like CoinMarketCap, reject the whole batch if any symbol is unknown
+    def strict(symbols):
+        crypto.calls.append(list(symbols))
+        if "NOPE" in symbols:
+            return {}
+        return crypto(symbols)
+
+    monkeypatch.setattr(crypto_data, "fetch_many", strict)
+    requested, quotes = snapshots.refresh("crypto")
+
+    assert requested == ["BTC", "ETH", "NOPE"]
+    assert set(quotes) == {"BTC", "ETH"}
+
+
+def test_pages_render_from_snapshots(client, upstream, symbols):
+    crypto, securities = upstream
+    call_command("refresh_quotes")
+    crypto.calls.clear()
+    securities.calls.clear()
+
+    response = client.get("/crypto/")
+    assert response.context["data"][0]["symbol"] == "BTC"
+    assert response.context["last_updated"] is not None
+    assert b"Last updated" in response.content
+
+    response = client.get("/securities/")
+    assert response.context["data"][0]["price"] == 5
+
+    assert crypto.calls == []
+    assert securities.calls == []
+
+
+def test_symbol_without_snapshot_uses_the_cache(client, upstream, user):
+    crypto, securities = upstream
+    SecuritiesSymbol.objects.create(
+        user=user, symbol="TSLA", name="Tesla", exchange="NASDAQ"
+    )
+
+    response = client.get("/securities/")
+    assert response.context["data"][0]["price"] == 5
+    assert response.context["last_updated"] is None
+    assert securities.calls == [["TSLA"]]
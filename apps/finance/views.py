@@ -3,6 +3,7 @@ from django.shortcuts import render
 
 import apps.finance.crypto_data as crypto_data
 import apps.finance.securities_data as securities_data
+from apps.finance import snapshots
 
 from .models import CryptoSymbol, SecuritiesSymbol
 
@@ -21,10 +22,10 @@ def crypto(request, ord="market_cap"):
 
     if user_symbols.exists():
         # Use user's custom symbols
-        symbols = ",".join([symbol.symbol for symbol in user_symbols])
+        symbols = [symbol.symbol for symbol in user_symbols]
 
-        # collect data from remote service
-        data = crypto_data.collect(symbols)
+        # collect data from the snapshots saved by the refresh_quotes command
+        data, last_updated = snapshots.get_quotes("crypto", symbols)
 
         # condense and sort the data
         data = crypto_data.condense(data)
@@ -35,11 +36,13 @@ def crypto(request, ord="market_cap"):
     else:
         # No symbols configured - show empty state
         data = []
+        last_updated = None
 
     context = {
         "page": "crypto",
         "ord": ord,
         "data": data,
+        "last_updated": last_updated,
     }
     return render(request, "finance/crypto.html", context)
 
@@ -69,19 +72,24 @@ def securities(request, ord="name"):
                 }
             )
 
-        # Collect data from remote service
-        data = securities_data.collect(asset_list)
+        # Collect data from the snapshots saved by the refresh_quotes command
+        quotes, last_updated = snapshots.get_quotes(
+            "securities", [asset["symbol"] for asset in asset_list]
+        )
+        data = securities_data.collect(asset_list, quotes)
 
         # Sort the data according to the user indicated field
         data = securities_data.sort(data, ord)
     else:
         # No symbols configured - show empty state
         data = []
+        last_updated = None
 
     context = {
         "page": "securities",
         "ord": ord,
         "data": data,
+        "last_updated": last_updated,
     }
     return render(request, "finance/securities.html", context)
 
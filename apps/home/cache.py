@@ -0,0 +1,143 @@
+"""Per-user cache of the rendered home page fragments.
+
+Each user has a version token per fragment. Fragments are stored under a key
+that includes the current token, so expiring a fragment is a matter of
+replacing the token; the stale entry is never read again and ages out.
+"""
+
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from apps.folders.models import Folder
+
+FRAGMENTS = ("favorites", "tasks", "due_tasks")
+
+# how long a rendered fragment is kept once written
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(user_id, fragment):
+    return f"home:{user_id}:{fragment}:version"
+
+
+def _fragment_key(user_id, fragment, version, suffix=""):
+    return f"home:{user_id}:{fragment}:{version}:{suffix}"
+
+
+def get_versions(user_id, fragments):
+    """Get the current version token of each fragment, creating any missing.
+
+    Args:
+        user_id (int): the user whose fragments are looked up
+        fragments (iterable): fragment names, e.g. "favorites"
+
+    Returns:
+        versions (dict): fragment name to version token
+
+    """
+    keys = {_version_key(user_id, fragment): fragment for fragment in fragments}
+    found = cache.get_many(keys)
+
+    missing = {key: uuid4().hex for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+
+    return {fragment: found[key] for key, fragment in keys.items()}
+
+
+def get_fragments(user_id, suffixes):
+    """Get whichever of the requested fragments are cached.
+
+    Args:
+        user_id (int): the user whose fragments are looked up
+        suffixes (dict): fragment name to a key suffix, for fragments that
+            also depend on something other than the user's data (e.g. the date)
+
+    Returns:
+        versions (dict): fragment name to version token, for set_fragments
+        html (dict): fragment name to rendered html, for cache hits only
+
+    """
+    versions = get_versions(user_id, suffixes)
+    keys = {
+        _fragment_key(user_id, fragment, versions[fragment], suffix): fragment
+        for fragment, suffix in suffixes.items()
+    }
+    found = cache.get_many(keys)
+    html = {keys[key]: value for key, value in found.items()}
+    return versions, html
+
+
+def set_fragments(user_id, versions, suffixes, html):
+    """Store freshly rendered fragments.
+
+    Args:
+        user_id (int): the user the fragments belong to
+        versions (dict): the version tokens returned by get_fragments
+        suffixes (dict): the key suffixes passed to get_fragments
+        html (dict): fragment name to rendered html
+
+    """
+    cache.set_many(
+        {
+            _fragment_key(
+                user_id, fragment, versions[fragment], suffixes[fragment]
+            ): value
+            for fragment, value in html.items()
+        },
+        FRAGMENT_TIMEOUT,
+    )
+
+
+def expire(user_ids, fragments=FRAGMENTS):
+    """Expire cached fragments for a set of users.
+
+    Args:
+        user_ids (iterable): the users whose fragments are out of date
+        fragments (iterable): the fragments to expire, defaults to all
+
+    """
+    tokens = {
+        _version_key(user_id, fragment): uuid4().hex
+        for user_id in set(user_ids)
+        if user_id
+        for fragment in fragments
+    }
+    if tokens:
+        cache.set_many(tokens, None)
+
+
+def folder_user_ids(folder_ids):
+    """Get the owners and editors of a set of folders.
+
+    Args:
+        folder_ids (iterable): Folder ids
+
+    Returns:
+        user_ids (set): ids of every user who sees these folders
+
+    """
+    folder_ids = [folder_id for folder_id in folder_ids if folder_id]
+    if not folder_ids:
+        return set()
+
+    rows = Folder.objects.filter(pk__in=folder_ids).values_list("user_id", "editors")
+    user_ids = set()
+    for owner_id, editor_id in rows:
+        user_ids.add(owner_id)
+        if editor_id:
+            user_ids.add(editor_id)
+    return user_ids
+
+
+def expire_folders(folder_ids, fragments=FRAGMENTS):
+    """Expire cached fragments for everyone who sees a set of folders.
+
+    Args:
+        folder_ids (iterable): Folder ids whose contents or placement changed
+        fragments (iterable): the fragments to expire, defaults to all
+
+    """
+    expire(folder_user_ids(folder_ids), fragments)
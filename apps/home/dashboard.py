@@ -0,0 +1,177 @@
+from datetime import date, timedelta
+
+from django.db.models import Prefetch, Q, prefetch_related_objects
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from apps.favorites.models import Favorite
+from apps.folders.models import Folder
+from apps.home import cache
+from apps.tasks.models import Task
+
+HOME_COLUMNS = 5
+
+
+def get_home_folders(user):
+    """Get every folder that appears on the home page in a single query.
+
+    Args:
+        user : a request customuser
+
+    Returns:
+        folders (list): task folders placed on the home page (home_column > 1)
+            and favorites folders placed in one of the home page columns,
+            whether owned by the user or shared with them
+
+    """
+    placed = Q(page="tasks", home_column__gt=1) | Q(
+        page="favorites", home_column__gte=1, home_column__lte=HOME_COLUMNS
+    )
+    folders = (
+        Folder.objects.filter(placed)
+        .filter(Q(user=user) | Q(editors=user))
+        .distinct()
+        .order_by("name")
+    )
+    return list(folders)
+
+
+def get_task_folders(folders):
+    """Attach pending tasks to the task folders, dropping empty folders.
+
+    Args:
+        folders (list): folders from get_home_folders
+
+    Returns:
+        task_folders (list): task folders, ordered by name, each with a "tasks"
+            attribute holding its pending tasks
+
+    Notes:
+        All tasks are loaded with one prefetch query, however many folders.
+
+    """
+    task_folders = [folder for folder in folders if folder.page == "tasks"]
+
+    tasks = (
+        Task.objects.filter(is_recurring=False, archived=False)
+        .exclude(status=1)
+        .order_by("status", "title")
+    )
+    prefetch_related_objects(
+        task_folders, Prefetch("task_set", queryset=tasks, to_attr="tasks")
+    )
+
+    return [folder for folder in task_folders if folder.tasks]
+
+
+def get_favorite_columns(folders):
+    """Arrange the favorites folders into the home page columns.
+
+    Args:
+        folders (list): folders from get_home_folders
+
+    Returns:
+        columns (list): one list of folders per column, ordered by home_rank,
+            each folder with a "favorites" attribute holding its home favorites
+
+    Notes:
+        All favorites are loaded with one prefetch query, however many folders.
+
+    """
+    favorite_folders = [folder for folder in folders if folder.page == "favorites"]
+
+    favorites = Favorite.objects.filter(home_rank__gt=0).order_by("home_rank")
+    prefetch_related_objects(
+        favorite_folders,
+        Prefetch("favorite_set", queryset=favorites, to_attr="favorites"),
+    )
+
+    columns = [[] for _ in range(HOME_COLUMNS)]
+    for folder in favorite_folders:
+        columns[folder.home_column - 1].append(folder)
+
+    for column in columns:
+        column.sort(key=lambda folder: (folder.home_rank is None, folder.home_rank))
+
+    return columns
+
+
+def get_due_tasks(user):
+    """Get the user's pending tasks due in the next three days.
+
+    Args:
+        user : a request customuser
+
+    Returns:
+        due_tasks (QuerySet): tasks with their folders joined in
+
+    """
+    today = date.today()
+    three_days = today + timedelta(days=3)
+    due_tasks = (
+        Task.objects.filter(
+            user=user,
+            status=0,
+            is_recurring=False,
+            archived=False,
+            due_date__gte=today,
+            due_date__lte=three_days,
+        )
+        .select_related("folder")
+        .order_by("due_date", "due_time", "title")
+    )
+    return due_tasks
+
+
+def render_fragments(user, sections):
+    """Render the home page fragments, reusing cached html where possible.
+
+    Args:
+        user : a request customuser
+        sections (list): the fragments to render,
+            any of "favorites", "tasks" and "due_tasks"
+
+    Returns:
+        fragments (dict): section name to rendered html, which is empty
+            for a tasks section with nothing to show
+
+    Notes:
+        Only the sections missing from the cache are loaded from the
+        database, so a warm home page runs no folder or favorite queries.
+
+    """
+    # due tasks depend on the date as well as on the tasks themselves
+    suffixes = {section: "" for section in sections}
+    if "due_tasks" in suffixes:
+        suffixes["due_tasks"] = date.today().isoformat()
+
+    versions, fragments = cache.get_fragments(user.id, suffixes)
+
+    missing = [section for section in sections if section not in fragments]
+    if missing:
+        rendered = {}
+        context = {"origin": "home"}
+
+        if "favorites" in missing or "tasks" in missing:
+            folders = get_home_folders(user)
+
+        if "favorites" in missing:
+            context["columns"] = get_favorite_columns(folders)
+            rendered["favorites"] = render_to_string("home/favorites.html", context)
+
+        if "tasks" in missing:
+            context["task_folders"] = get_task_folders(folders)
+            rendered["tasks"] = ""
+            if context["task_folders"]:
+                rendered["tasks"] = render_to_string("home/tasks.html", context)
+
+        if "due_tasks" in missing:
+            context["due_tasks"] = list(get_due_tasks(user))
+            rendered["due_tasks"] = ""
+            if context["due_tasks"]:
+                rendered["due_tasks"] = render_to_string("home/due_tasks.html", context)
+
+        cache.set_fragments(user.id, versions, suffixes, rendered)
+        fragments.update(rendered)
+
+    return {section: mark_safe(html) for section, html in fragments.items()}
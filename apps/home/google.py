@@ -1,84 +1,219 @@
-import json
-from datetime import date, datetime, timedelta
+"""Upcoming events from Google Calendar.
+
+Events are synced into the CalendarEvent table, incrementally using the
+syncToken Google returns at the end of each sync, and the home page reads
+them from there. A sync runs from the sync_calendars command, or in the
+background when the home page finds a user's events older than
+CALENDAR_SYNC_INTERVAL seconds, never while the page waits.
+"""
+
+import logging
+import threading
+from datetime import date, timedelta
 
-import google.oauth2.credentials
-from apiclient.discovery import build
 from dateutil.parser import parse
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from googleapiclient.errors import HttpError
 
-from accounts.models import CustomUser
+from apps.common import google_api
+from apps.home.models import CalendarEvent, CalendarSync
 
+logger = logging.getLogger(__name__)
 
-def build_service(user_id):
-    user = get_object_or_404(CustomUser, pk=user_id)
-    credentials = user.google_credentials
+# events per page of a sync, the most the Calendar API allows
+SYNC_PAGE_SIZE = 2500
 
-    if credentials:
-        credentials = json.loads(credentials)
-        credentials = google.oauth2.credentials.Credentials.from_authorized_user_info(
-            credentials
-        )
-        service = build("calendar", "v3", credentials=credentials)
-        return service
-    else:
-        return False
-
-
-def get_events(user_id):
-    service = build_service(user_id)
-
-    now = datetime.utcnow().isoformat() + "Z"  # 'Z' indicates UTC time
-    one_week = (datetime.utcnow() + timedelta(days=7)).isoformat() + "Z"
-    events_result = (
-        service.events()
-        .list(
-            calendarId="primary",
-            timeMin=now,
-            timeMax=one_week,
-            maxResults=10,
-            singleEvents=True,
-            orderBy="startTime",
-        )
-        .execute()
-    )
-    events = events_result.get("items", [])
+# how long a sync may hold the lock before another worker may try
+SYNC_LOCK_TIMEOUT = 300
+
+# events left off the home page
+HIDDEN_SUMMARIES = ["Change water fountain filter"]
+
+
+def build_service(user):
+    """Get a Calendar service for a user.
 
-    if events:
-        events_simplified = []
+    Returns:
+        service (Resource): the Calendar service, or False if the user
+            hasn't connected a Google account
 
-        for event in events:
-            event_simple = {}
-            start = event["start"].get("dateTime", event["start"].get("date"))
-            start = parse(start)
+    """
+    return google_api.get_service(user, "calendar")
 
-            event_simple["date"] = start.strftime("%Y-%m-%d")
-            event_simple["weekday"] = start.strftime("%A")
-            event_simple["month"] = start.strftime("%B")
 
-            event_simple["time"] = start.strftime("%I:%M %p")
-            if event_simple["time"] == "12:00 AM":
-                event_simple["time"] = ""
+def _parse_event(user, event):
+    start = event["start"].get("dateTime", event["start"].get("date"))
+    end = event["end"].get("dateTime", event["end"].get("date"))
+    start = parse(start)
+    end = parse(end)
 
-            event_simple["summary"] = event["summary"]
+    # all-day events have dates, not times; place them in the site's time zone
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end)
 
-            today = date.today()
-            soon = today + timedelta(days=3)
-            pydate = date.fromisoformat(event_simple["date"])
+    time_string = start.strftime("%I:%M %p")
+    if time_string == "12:00 AM":
+        time_string = ""
 
-            if pydate <= soon:
-                event_simple["soon"] = "soon"
+    return CalendarEvent(
+        user=user,
+        event_id=event["id"],
+        summary=event.get("summary", ""),
+        start=start,
+        end=end,
+        date=start.date(),
+        time=time_string,
+    )
+
+
+def _list_events(service, sync_token):
+    """Yield each page of events changed since the sync token was issued."""
+    params = {
+        "calendarId": "primary",
+        "singleEvents": True,
+        "maxResults": SYNC_PAGE_SIZE,
+    }
+    if sync_token:
+        params["syncToken"] = sync_token
+
+    while True:
+        page = service.events().list(**params).execute()
+        yield page
+        if "nextPageToken" not in page:
+            return
+        params["pageToken"] = page["nextPageToken"]
+
+
+def sync_events(user):
+    """Bring a user's stored events up to date with their Google Calendar.
+
+    Args:
+        user (CustomUser): a user with Google credentials
+
+    Notes:
+        With a sync token, only the events changed since the last sync are
+        fetched; without one, or once Google expires it, the user's events
+        are replaced by a full sync. Events that have already ended are
+        dropped, so the table only holds what the home page can show.
+
+    """
+    calendar_sync, _ = CalendarSync.objects.get_or_create(user=user)
+    service = build_service(user)
+    sync_token = calendar_sync.sync_token
+    now = timezone.now()
+
+    try:
+        pages = list(_list_events(service, sync_token))
+    except HttpError as e:
+        # 410 Gone: the sync token expired, start over with a full sync
+        if e.resp.status != 410 or not sync_token:
+            raise
+        sync_token = ""
+        pages = list(_list_events(service, sync_token))
+
+    # the latest change to each event wins
+    changed = {}
+    cancelled = set()
+    for page in pages:
+        for event in page.get("items", []):
+            if event.get("status") == "cancelled":
+                changed.pop(event["id"], None)
+                cancelled.add(event["id"])
             else:
-                event_simple["soon"] = ""
+                changed[event["id"]] = _parse_event(user, event)
+                cancelled.discard(event["id"])
+
+    with transaction.atomic():
+        events = CalendarEvent.objects.filter(user=user)
+        if not sync_token:
+            events.delete()
+        events.filter(event_id__in=cancelled).delete()
+        events.filter(end__lte=now).delete()
+        CalendarEvent.objects.bulk_create(
+            [event for event in changed.values() if event.end > now],
+            update_conflicts=True,
+            unique_fields=["user", "event_id"],
+            update_fields=["summary", "start", "end", "date", "time"],
+        )
+
+        calendar_sync.sync_token = pages[-1].get("nextSyncToken", "")
+        calendar_sync.synced_at = now
+        calendar_sync.save()
+
+
+def _sync_lock_key(user_id):
+    return f"calendar:{user_id}:sync"
 
-            events_simplified.append(event_simple)
 
-        events_simplified = [
-            i
-            for i in events_simplified
-            if not (i["summary"] == "Change water fountain filter")
-        ]
+def _sync_in_background(user):
+    try:
+        sync_events(user)
+    except Exception as e:
+        logger.warning(f"Failed to sync calendar for user {user.id}: {e}")
+    finally:
+        cache.delete(_sync_lock_key(user.id))
+        connection.close()
 
-        return events_simplified
 
-    else:
-        return None
+def run_in_background(function, *args):
+    """Run a calendar sync without holding up the request."""
+    threading.Thread(target=function, args=args, daemon=True).start()
+
+
+def is_stale(user):
+    """Whether a user's stored events are due for a sync."""
+    calendar_sync = CalendarSync.objects.filter(user=user).first()
+    if calendar_sync is None or calendar_sync.synced_at is None:
+        return True
+    age = timezone.now() - calendar_sync.synced_at
+    return age.total_seconds() >= settings.CALENDAR_SYNC_INTERVAL
+
+
+def get_events(user):
+    """Get a user's events for the coming week from the stored events.
+
+    Args:
+        user (CustomUser): a user with Google credentials
+
+    Returns:
+        events (list): simplified events for the home page, or None
+
+    Notes:
+        This makes no calls to Google. If the stored events are stale,
+        a sync is started in the background for the next page load.
+
+    """
+    if is_stale(user) and cache.add(_sync_lock_key(user.id), True, SYNC_LOCK_TIMEOUT):
+        run_in_background(_sync_in_background, user)
+
+    now = timezone.now()
+    events = (
+        CalendarEvent.objects.filter(
+            user=user, end__gt=now, start__lt=now + timedelta(days=7)
+        )
+        .exclude(summary__in=HIDDEN_SUMMARIES)
+        .order_by("start")[:10]
+    )
+
+    today = date.today()
+    soon = today + timedelta(days=3)
+
+    events_simplified = []
+    for event in events:
+        events_simplified.append(
+            {
+                "date": event.date.isoformat(),
+                "weekday": event.date.strftime("%A"),
+                "month": event.date.strftime("%B"),
+                "time": event.time,
+                "summary": event.summary,
+                "soon": "soon" if event.date <= soon else "",
+            }
+        )
+
+    return events_simplified or None
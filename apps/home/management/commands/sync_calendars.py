@@ -0,0 +1,36 @@
+"""
+Sync upcoming events from Google Calendar for every connected user.
+
+Run every 5 minutes via cron:
+    */5 * * * * cd /home/james/mh && /home/james/.venvs/mh/bin/python manage.py sync_calendars
+"""
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import CustomUser
+from apps.home.google import sync_events
+
+
+class Command(BaseCommand):
+    help = "Sync upcoming events from Google Calendar"
+
+    def handle(self, *args, **options):
+        synced_count = 0
+        error_count = 0
+
+        users = CustomUser.objects.exclude(google_credentials__isnull=True).exclude(
+            google_credentials=""
+        )
+        for user in users:
+            try:
+                sync_events(user)
+                synced_count += 1
+            except Exception as e:
+                self.stderr.write(f"Failed to sync calendar for {user.username}: {e}")
+                error_count += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Synced {synced_count} calendar(s), {error_count} error(s)"
+            )
+        )
@@ -1,3 +1,60 @@
 from django.db import models
 
-# Create your models here.
+from accounts.models import CustomUser
+from apps.common.models import TimestampMixin
+
+
+class CalendarSync(TimestampMixin, models.Model):
+    """The state of a user's Google Calendar sync.
+
+    Attributes:
+        user (int): the user whose calendar is synced
+        sync_token (str): the token for the next incremental sync, empty
+            when the next sync has to be a full one
+        synced_at (datetime): when the calendar was last synced
+    """
+
+    user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, related_name="calendar_sync"
+    )
+    sync_token = models.CharField(max_length=255, blank=True, default="")
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "app_calendar_sync"
+
+    def __str__(self):
+        return f"{self.user.username} : {self.synced_at}"
+
+
+class CalendarEvent(models.Model):
+    """An upcoming event from a user's Google Calendar.
+
+    Attributes:
+        user (int): the user whose calendar the event is on
+        event_id (str): Google's identifier for the event
+        summary (str): the event's title
+        start (datetime): when the event starts
+        end (datetime): when the event ends
+        date (date): the day the event starts, in the calendar's time zone
+        time (str): the time the event starts, e.g. "09:30 AM", or empty
+            for an all-day event
+    """
+
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="calendar_events"
+    )
+    event_id = models.CharField(max_length=1024)
+    summary = models.TextField(blank=True, default="")
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    date = models.DateField()
+    time = models.CharField(max_length=8, blank=True, default="")
+
+    class Meta:
+        db_table = "app_calendar_event"
+        unique_together = ["user", "event_id"]
+        indexes = [models.Index(fields=["user", "start"])]
+
+    def __str__(self):
+        return f"{self.summary} : {self.date}"
@@ -0,0 +1,94 @@
+"""Expire cached home page fragments when the data behind them changes."""
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from apps.favorites.models import Favorite
+from apps.folders.models import Folder
+from apps.home.cache import FRAGMENTS, expire, folder_user_ids
+from apps.tasks.models import Task
+
+TASK_FRAGMENTS = ("tasks", "due_tasks")
+
+PAGE_FRAGMENTS = {
+    "favorites": ("favorites",),
+    "tasks": TASK_FRAGMENTS,
+}
+
+
+def _expire_on_commit(user_ids, fragments):
+    transaction.on_commit(lambda: expire(user_ids, fragments))
+
+
+@receiver(post_init, sender=Favorite)
+@receiver(post_init, sender=Task)
+def remember_folder(sender, instance, **kwargs):
+    # a moved item also has to leave the home page of its old folder's editors
+    # (read from __dict__ so a deferred folder_id doesn't cost a query)
+    instance._home_folder_id = instance.__dict__.get("folder_id")
+
+
+def _item_user_ids(instance):
+    user_ids = folder_user_ids(
+        {getattr(instance, "_home_folder_id", None), instance.folder_id}
+    )
+    user_ids.add(instance.user_id)
+    instance._home_folder_id = instance.folder_id
+    return user_ids
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+def favorite_changed(sender, instance, **kwargs):
+    _expire_on_commit(_item_user_ids(instance), ("favorites",))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    _expire_on_commit(_item_user_ids(instance), TASK_FRAGMENTS)
+
+
+@receiver(pre_delete, sender=Folder)
+def folder_deleting(sender, instance, **kwargs):
+    # the editors are gone by the time post_delete runs, so collect them now
+    instance._home_user_ids = folder_user_ids([instance.pk])
+
+
+@receiver(post_save, sender=Folder)
+@receiver(post_delete, sender=Folder)
+def folder_changed(sender, instance, **kwargs):
+    user_ids = getattr(instance, "_home_user_ids", None)
+    if user_ids is None:
+        user_ids = folder_user_ids([instance.pk])
+    user_ids.add(instance.user_id)
+    _expire_on_commit(user_ids, PAGE_FRAGMENTS.get(instance.page, ()))
+
+
+@receiver(m2m_changed, sender=Folder.editors.through)
+def folder_editors_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return
+
+    if reverse:
+        # instance is the editor, pk_set holds folder ids
+        user_ids = folder_user_ids(pk_set or ())
+        user_ids.add(instance.pk)
+        _expire_on_commit(user_ids, FRAGMENTS)
+        return
+
+    if action == "pre_clear":
+        # pk_set is not provided on clear, so note the editors beforehand
+        instance._home_editor_ids = set(instance.editors.values_list("id", flat=True))
+        return
+
+    user_ids = set(pk_set or ()) | getattr(instance, "_home_editor_ids", set())
+    user_ids.add(instance.user_id)
+    _expire_on_commit(user_ids, PAGE_FRAGMENTS.get(instance.page, ()))
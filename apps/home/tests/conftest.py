@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 from django.test import Client
 
 from accounts.models import CustomUser
@@ -167,3 +168,8 @@ def favorites(user, folders):
         )
 
     return favorites
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
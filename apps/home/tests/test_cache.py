@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.favorites.models import Favorite
+from apps.folders.models import Folder
+from apps.tasks.models import Task
+
+pytestmark = pytest.mark.django_db(transaction=True, reset_sequences=True)
+
+
+def home_queries(client):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get("/home/")
+    assert response.status_code == 200
+    return [query["sql"] for query in context.captured_queries], response
+
+
+def test_warm_home_page_skips_folders_and_favorites(client, favorites):
+    client.get("/home/")
+
+    queries, response = home_queries(client)
+    assert b"Favorite No. 1" in response.content
+    assert not any("app_folder" in sql for sql in queries)
+    assert not any("app_favorite" in sql for sql in queries)
+
+
+def test_saving_a_favorite_expires_the_cache(client, favorites):
+    client.get("/home/")
+
+    favorite = favorites[0]
+    favorite.name = "Renamed"
+    favorite.save()
+
+    response = client.get("/home/")
+    assert b"Renamed" in response.content
+
+
+def test_deleting_a_folder_expires_the_cache(client, folders):
+    client.get("/home/")
+
+    folders[0].delete()
+
+    response = client.get("/home/")
+    assert b">Main<" not in response.content
+
+
+def test_saving_a_task_expires_the_cache(client, user):
+    folder = Folder.objects.create(
+        user=user, page="tasks", name="Chores", home_column=2
+    )
+    client.get("/home/")
+
+    Task.objects.create(user=user, folder=folder, title="Sweep", status=0)
+
+    response = client.get("/home/")
+    assert b"Sweep" in response.content
+
+
+def test_sharing_a_folder_expires_the_editors_cache(client, user, django_user_model):
+    owner = django_user_model.objects.create_user("Marlo", "marlo@gmail.com", "pw")
+    folder = Folder.objects.create(
+        user=owner, page="favorites", name="Shared", home_column=1, home_rank=1
+    )
+    client.get("/home/")
+
+    folder.editors.add(user)
+
+    response = client.get("/home/")
+    assert b">Shared<" in response.content
+
+
+def test_reorder_endpoint_expires_the_cache(client, favorites):
+    response = client.get("/home/")
+    content = response.content.decode()
+    assert content.index("Favorite No. 1") < content.index("Favorite No. 2")
+
+    ids = [favorite.id for favorite in reversed(favorites)]
+    client.post(
+        "/home/reorder-favorites/",
+        {"folder_id": favorites[0].folder_id, "favorite_ids": json.dumps(ids)},
+    )
+    assert Favorite.objects.get(pk=favorites[0].id).home_rank == 5
+
+    response = client.get("/home/")
+    content = response.content.decode()
+    assert content.index("Favorite No. 2") < content.index("Favorite No. 1")
@@ -0,0 +1,102 @@
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.favorites.models import Favorite
+from apps.folders.models import Folder
+from apps.home.dashboard import get_favorite_columns, get_home_folders
+from apps.tasks.models import Task
+
+pytestmark = pytest.mark.django_db(transaction=True, reset_sequences=True)
+
+
+def populate(user, count):
+    """Create favorites folders, task folders, favorites and tasks."""
+    for i in range(count):
+        folder = Folder.objects.create(
+            user=user,
+            page="favorites",
+            name=f"Favorites {i}",
+            home_column=i % 5 + 1,
+            home_rank=i // 5 + 1,
+        )
+        Favorite.objects.bulk_create(
+            Favorite(user=user, folder=folder, name=f"Favorite {i}.{j}", home_rank=j)
+            for j in range(1, 4)
+        )
+
+        folder = Folder.objects.create(
+            user=user, page="tasks", name=f"Tasks {i}", home_column=2
+        )
+        Task.objects.create(user=user, folder=folder, title=f"Task {i}", status=0)
+        Task.objects.create(
+            user=user, folder=folder, title=f"Due {i}", status=0, due_date=date.today()
+        )
+
+
+def count_queries(client):
+    # measure a cold home page, the cached fragments would hide the queries
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get("/home/")
+    assert response.status_code == 200
+    return len(context.captured_queries), response
+
+
+def test_query_count_is_constant(client, user):
+    user.home_due_tasks = 1
+    user.save()
+
+    # the first view resets expired hidden sections, so warm up beforehand
+    client.get("/home/")
+
+    populate(user, 2)
+    small, response = count_queries(client)
+    assert response.content.count(b'class="list-group tasks-list"') == 3
+
+    populate(user, 200)
+    large, response = count_queries(client)
+    assert response.content.count(b'class="list-group tasks-list"') == 203
+    assert response.content.count(b'class="card folder"') == 202
+
+    assert large == small
+
+
+def test_empty_task_folders_are_hidden(client, user):
+    folder = Folder.objects.create(user=user, page="tasks", name="Empty", home_column=2)
+    Task.objects.create(user=user, folder=folder, title="Done", status=1)
+
+    response = client.get("/home/")
+    assert response.context["fragments"]["tasks"] == ""
+
+
+def test_columns_are_ranked(user, folders, favorites):
+    columns = get_favorite_columns(get_home_folders(user))
+    assert len(columns) == 5
+    assert [folder.name for folder in columns[0]] == [
+        "Main",
+        "Entertainment",
+        "Local",
+        "Social",
+    ]
+    assert [favorite.home_rank for favorite in columns[0][0].favorites] == [
+        1,
+        2,
+        3,
+        4,
+        5,
+    ]
+
+
+def test_shared_folders_are_included(user, django_user_model):
+    owner = django_user_model.objects.create_user("Marlo", "marlo@gmail.com", "pw")
+    folder = Folder.objects.create(
+        user=owner, page="favorites", name="Shared", home_column=1, home_rank=1
+    )
+    folder.editors.add(user, owner)
+
+    folders = get_home_folders(user)
+    assert [folder.name for folder in folders] == ["Shared"]
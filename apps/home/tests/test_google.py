@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+import apps.home.google as google
+from apps.home.models import CalendarEvent, CalendarSync
+
+pytestmark = pytest.mark.django_db
+
+
+def event(event_id, summary, days, status="confirmed"):
+    start = timezone.localtime() + timedelta(days=days)
+    return {
+        "id": event_id,
+        "status": status,
+        "summary": summary,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(hours=1)).isoformat()},
+    }
+
+
+class Calendar:
+    """A fake Calendar service answering events().list() from a script."""
+
+    def __init__(self):
+        self.calls = []
+        self.pages = {}
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        self.calls.append(params)
+        self.params = params
+        return self
+
+    def execute(self):
+        key = self.params.get("syncToken"), self.params.get("pageToken")
+        page = self.pages[key]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+@pytest.fixture
+def calendar(user, monkeypatch):
+    user.google_credentials = "{}"
+    user.save()
+    calendar = Calendar()
+    monkeypatch.setattr(google, "build_service", lambda user: calendar)
+    monkeypatch.setattr(
+        google, "run_in_background", lambda function, *args: function(*args)
+    )
+    monkeypatch.setattr(google.connection, "close", lambda: None)
+    return calendar
+
+
+def test_full_sync_stores_upcoming_events(user, calendar):
+    calendar.pages = {
+        (None, None): {
+            "items": [event("a", "Dentist", 1), event("old", "Past", -3)],
+            "nextPageToken": "p2",
+        },
+        (None, "p2"): {"items": [event("b", "Recital", 5)], "nextSyncToken": "s1"},
+    }
+
+    google.sync_events(user)
+
+    assert set(CalendarEvent.objects.values_list("event_id", flat=True)) == {"a", "b"}
+    assert CalendarSync.objects.get(user=user).sync_token == "s1"
+
+
+def test_incremental_sync_applies_changes(user, calendar):
+    calendar.pages = {
+        (None, None): {
+            "items": [event("a", "Dentist", 1), event("b", "Recital", 5)],
+            "nextSyncToken": "s1",
+        },
+        ("s1", None): {
+            "items": [
+                event("a", "Dentist (moved)", 2),
+                event("b", "", 5, status="cancelled"),
+                event("c", "Lunch", 3),
+            ],
+            "nextSyncToken": "s2",
+        },
+    }
+
+    google.sync_events(user)
+    google.sync_events(user)
+
+    assert calendar.calls[-1]["syncToken"] == "s1"
+    assert dict(CalendarEvent.objects.values_list("event_id", "summary")) == {
+        "a": "Dentist (moved)",
+        "c": "Lunch",
+    }
+    assert CalendarSync.objects.get(user=user).sync_token == "s2"
+
+
+def test_expired_sync_token_falls_back_to_full_sync(user, calendar):
+    CalendarSync.objects.create(user=user, sync_token="expired")
+    CalendarEvent.objects.create(
+        user=user,
+        event_id="gone",
+        summary="Gone",
+        start=timezone.now() + timedelta(days=1),
+        end=timezone.now() + timedelta(days=1, hours=1),
+        date=timezone.localdate(),
+    )
+    calendar.pages = {
+        ("expired", None): HttpError(Response({"status": 410}), b"Gone"),
+        (None, None): {"items": [event("a", "Dentist", 1)], "nextSyncToken": "s1"},
+    }
+
+    google.sync_events(user)
+
+    assert list(CalendarEvent.objects.values_list("event_id", flat=True)) == ["a"]
+    assert CalendarSync.objects.get(user=user).sync_token == "s1"
+
+
+def test_home_page_reads_stored_events(client, user, calendar):
+    calendar.pages = {
+        (None, None): {
+            "items": [
+                event("a", "Dentist", 1),
+                event("b", "Change water fountain filter", 2),
+                event("c", "Trip", 10),
+            ],
+            "nextSyncToken": "s1",
+        },
+    }
+
+    # the first load finds no stored events and starts a sync
+    client.get("/home/")
+    assert len(calendar.calls) == 1
+
+    response = client.get("/home/")
+    events = response.context["events"]
+    assert [e["summary"] for e in events] == ["Dentist"]
+    assert events[0]["soon"] == "soon"
+    assert len(calendar.calls) == 1
+
+
+def test_sync_calendars_command(user, calendar):
+    calendar.pages = {
+        (None, None): {"items": [event("a", "Dentist", 1)], "nextSyncToken": "s1"},
+    }
+
+    call_command("sync_calendars")
+
+    assert CalendarEvent.objects.filter(user=user).count() == 1
@@ -1,4 +1,4 @@
-from datetime import date, timedelta
+from datetime import date
 
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
@@ -6,11 +6,11 @@ from django.shortcuts import get_object_or_404, redirect, render
 
 import apps.home.google as google
 from apps.favorites.models import Favorite
-from apps.folders.folders import get_folders_for_page
 from apps.folders.models import Folder
+from apps.home.cache import expire_folders
+from apps.home.dashboard import render_fragments
 from apps.home.movement import sequence
 from apps.home.toggle import show_section
-from apps.tasks.models import Task
 
 
 def get_search_context(user):
@@ -56,8 +56,8 @@ def index(request):
         # only show events if the user has connected a Google account
         if user.google_credentials:
 
-            # load the events from Google
-            events = google.get_events(user.id)
+            # load the events synced from Google
+            events = google.get_events(user)
 
         else:
             events = None
@@ -70,76 +70,27 @@ def index(request):
     # check whether tasks are shown or hidden
     show_tasks = show_section(user, "tasks")
 
-    # if tasks are shown, check for task_folders
-    # Get all task folders that user has access to (owned or shared)
-    all_task_folders = get_folders_for_page(request, "tasks")
-    task_folders = all_task_folders.filter(home_column__gt=1)
-    if task_folders:
-
-        # eliminate folders with no tasks
-        for folder in task_folders:
-            tasks = Task.objects.filter(
-                folder_id=folder.id, is_recurring=False, archived=False
-            ).exclude(status=1)
-            if not tasks:
-                task_folders = task_folders.exclude(id=folder.id)
-
-        # attatch tasks to folders with tasks
-        for folder in task_folders:
-            tasks = Task.objects.filter(
-                folder_id=folder.id, is_recurring=False, archived=False
-            ).exclude(status=1)
-            tasks = tasks.order_by("status", "title")
-            folder.tasks = tasks
-
-    # check whether there are some tasks in any of the folders
-    # if so, flag as true
-    # the purpose of this flag is to show the tasks area
-    # only if there are at least some unchecked tasks to display
-    some_tasks = False
-    if task_folders:
-        for folder in task_folders:
-            if folder.tasks:
-                some_tasks = True
-
     # DUE TASKS
     # ----------------
 
     # check whether due tasks section is shown or hidden
     show_due_tasks = show_section(user, "due_tasks")
 
-    # if due tasks are shown, load tasks due in the next 3 days
-    due_tasks = []
-    if show_due_tasks:
-        today = date.today()
-        three_days = today + timedelta(days=3)
-        due_tasks = Task.objects.filter(
-            user=user,
-            status=0,
-            is_recurring=False,
-            archived=False,
-            due_date__gte=today,
-            due_date__lte=three_days,
-        ).order_by("due_date", "due_time", "title")
-
     # SEARCH
     # ----------------
     search_context = get_search_context(user)
 
-    # FAVORITES
+    # FRAGMENTS
     # ----------------
 
-    columns = []
-    for i in range(1, 6):
-        # Get all favorites folders that user has access to (owned or shared)
-        all_favorites_folders = get_folders_for_page(request, "favorites")
-        folders = all_favorites_folders.filter(home_column=i)
-        folders = folders.order_by("home_rank")
-        for folder in folders:
-            favorites = Favorite.objects.filter(folder_id=folder.id, home_rank__gt=0)
-            favorites = favorites.order_by("home_rank")
-            folder.favorites = favorites
-        columns.append(folders)
+    # favorites columns, task folders and due tasks are rendered once
+    # and cached per user until the underlying data changes
+    sections = ["favorites"]
+    if show_tasks:
+        sections.append("tasks")
+    if show_due_tasks:
+        sections.append("due_tasks")
+    fragments = render_fragments(user, sections)
 
     moved_folder = request.session.get("moved_folder", 0)
     if moved_folder:
@@ -149,13 +100,10 @@ def index(request):
         "page": "home",
         "origin": "home",
         "show_tasks": show_tasks,
-        "task_folders": task_folders,
-        "some_tasks": some_tasks,
         "show_due_tasks": show_due_tasks,
-        "due_tasks": due_tasks,
         "events": events,
         "show_events": show_events,
-        "columns": columns,
+        "fragments": fragments,
         "moved_folder": moved_folder,
     }
 
@@ -409,6 +357,9 @@ def update_folder_column(request):
                             home_rank=folder.home_rank
                         )
 
+                    # update() skips the signals that expire the home page cache
+                    expire_folders([folder.pk for folder in folders_list])
+
                     return JsonResponse(
                         {
                             "success": True,
@@ -481,6 +432,9 @@ def update_folder_column(request):
             # Resequence origin column
             sequence(request.user, origin_column)
 
+            # update() skips the signals that expire the home page cache
+            expire_folders([moved_folder.pk])
+
             return JsonResponse(
                 {
                     "success": True,
@@ -533,6 +487,9 @@ def swap_folder_positions(request):
         Folder.objects.filter(pk=dragged_folder.pk).update(home_rank=target_rank)
         Folder.objects.filter(pk=target_folder.pk).update(home_rank=dragged_rank)
 
+        # update() skips the signals that expire the home page cache
+        expire_folders([dragged_folder.pk, target_folder.pk])
+
         return JsonResponse({"success": True, "message": "Swapped folder positions"})
 
     except (ValueError, TypeError):
@@ -621,6 +578,9 @@ def reorder_favorites(request):
                 pk=int(fav_id), user=request.user, folder_id=folder_id
             ).update(home_rank=index + 1)
 
+        # update() skips the signals that expire the home page cache
+        expire_folders([folder_id], ["favorites"])
+
         return JsonResponse({"success": True, "message": "Favorites reordered"})
 
     except (ValueError, TypeError, json.JSONDecodeError):
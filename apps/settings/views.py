@@ -8,6 +8,7 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_POST
 
+from apps.common import google_api
 from apps.finance.forms import CryptoSymbolForm, SecuritiesSymbolForm
 from apps.finance.models import CryptoSymbol, SecuritiesSymbol
 from apps.notes.models import Note
@@ -203,9 +204,10 @@ def google_logout(request):
         headers={"content-type": "application/x-www-form-urlencoded"},
     )
 
-    # delete the credentials from the database
+    # delete the credentials from the database and the client cache
     user.google_credentials = None
     user.save()
+    google_api.forget(user.id)
 
     return redirect("/settings/google/")
 
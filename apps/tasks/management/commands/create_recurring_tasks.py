@@ -5,92 +5,121 @@ Run daily via cron:
     0 1 * * * cd /home/james/mh && /home/james/.venvs/mh/bin/python manage.py create_recurring_tasks
 """
 
-from datetime import date
+from datetime import date, timedelta
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q, Window
+from django.db.models.functions import RowNumber
 
 from apps.tasks.models import Task
 
+# instances written per INSERT
+BATCH_SIZE = 1000
+
+
+def pending_instances():
+    """Pending, non-archived instances generated from recurring templates."""
+    return Task.objects.filter(parent_task__isnull=False, status=0, archived=False)
+
+
+def due_templates(today):
+    """Build a filter matching the templates whose rule says to generate today.
+
+    Args:
+        today (date): the day being generated for
+
+    Returns:
+        due (Q): a filter for Task templates
+
+    Notes:
+        daily: not generated yet today
+        weekly: today is the template's weekday, and not generated this week
+        monthly: today is the template's day, and not generated this month
+        yearly: today is the template's day and month, not generated this year
+
+    """
+    never = Q(last_generated__isnull=True)
+    return (
+        Q(recurrence_type="daily") & (never | Q(last_generated__lt=today))
+        | Q(recurrence_type="weekly", recurrence_day=today.weekday())
+        & (never | Q(last_generated__lte=today - timedelta(days=7)))
+        | Q(recurrence_type="monthly", recurrence_day=today.day)
+        & (never | Q(last_generated__lt=today.replace(day=1)))
+        | Q(
+            recurrence_type="yearly",
+            recurrence_day=today.day,
+            recurrence_month=today.month,
+        )
+        & (never | Q(last_generated__lt=today.replace(month=1, day=1)))
+    )
+
 
 class Command(BaseCommand):
     help = "Generate task instances from recurring templates"
 
     def handle(self, *args, **options):
         today = date.today()
-        created_count = 0
-
-        recurring_tasks = Task.objects.filter(is_recurring=True, archived=False)
-
-        # Clean up accumulated pending instances: keep only the most recent per parent
-        for template in recurring_tasks:
-            pending = Task.objects.filter(
-                parent_task=template, status=0, archived=False
-            ).order_by("-due_date")
-            stale_ids = list(pending.values_list("id", flat=True)[1:])
-            if stale_ids:
-                Task.objects.filter(id__in=stale_ids).delete()
-
-        for template in recurring_tasks:
-            if self.should_generate(template, today):
-                self.create_instance(template, today)
-                template.last_generated = today
-                template.save(update_fields=["last_generated"])
-                created_count += 1
+
+        with transaction.atomic():
+            self.remove_stale_instances()
+            created_count = self.generate(today)
 
         self.stdout.write(
             self.style.SUCCESS(f"Created {created_count} recurring task(s)")
         )
 
-    def should_generate(self, template, today):
-        """Check if a new instance should be generated today."""
-        if Task.objects.filter(parent_task=template, status=0, archived=False).exists():
-            return False
-
-        last = template.last_generated
-
-        if template.recurrence_type == "daily":
-            # Generate if we haven't generated today
-            return last is None or last < today
-
-        elif template.recurrence_type == "weekly":
-            # Generate if today matches the weekday and not already generated this week
-            if today.weekday() != template.recurrence_day:
-                return False
-            if last is None:
-                return True
-            # Check if last_generated was in a previous week
-            days_since = (today - last).days
-            return days_since >= 7
-
-        elif template.recurrence_type == "monthly":
-            # Generate if today matches the day of month and not already generated this month
-            if today.day != template.recurrence_day:
-                return False
-            if last is None:
-                return True
-            # Check if last_generated was in a previous month
-            return last.year < today.year or last.month < today.month
-
-        elif template.recurrence_type == "yearly":
-            # Generate if today matches day and month, not already generated this year
-            if today.day != template.recurrence_day:
-                return False
-            if today.month != template.recurrence_month:
-                return False
-            if last is None:
-                return True
-            return last.year < today.year
-
-        return False
-
-    def create_instance(self, template, today):
-        """Create a new task instance from a recurring template."""
-        Task.objects.create(
-            user=template.user,
-            folder=template.folder,
-            title=template.title,
-            status=0,
-            due_date=today,
-            due_time=template.due_time,
-            parent_task=template,
+    def remove_stale_instances(self):
+        """Keep only the most recent pending instance of each active template."""
+        stale_ids = list(
+            pending_instances()
+            .filter(parent_task__is_recurring=True, parent_task__archived=False)
+            .annotate(
+                newest=Window(
+                    RowNumber(),
+                    partition_by=F("parent_task"),
+                    order_by=[F("due_date").desc(nulls_last=True), F("id").desc()],
+                )
+            )
+            .filter(newest__gt=1)
+            .values_list("id", flat=True)
+        )
+        if stale_ids:
+            Task.objects.filter(id__in=stale_ids).delete()
+
+    def generate(self, today):
+        """Create today's instances for every due template without a pending one.
+
+        Returns:
+            created_count (int): the number of instances created
+
+        """
+        templates = list(
+            Task.objects.filter(is_recurring=True, archived=False)
+            .filter(due_templates(today))
+            .exclude(Exists(pending_instances().filter(parent_task=OuterRef("pk"))))
+            .only("id", "user_id", "folder_id", "title", "due_time")
+        )
+
+        Task.objects.bulk_create(
+            [
+                Task(
+                    user_id=template.user_id,
+                    folder_id=template.folder_id,
+                    title=template.title,
+                    status=0,
+                    due_date=today,
+                    due_time=template.due_time,
+                    parent_task_id=template.id,
+                )
+                for template in templates
+            ],
+            batch_size=BATCH_SIZE,
         )
+
+        # every template gets the same date, so one UPDATE covers them all
+        Task.objects.filter(id__in=[template.id for template in templates]).update(
+            last_generated=today
+        )
+
+        return len(templates)
@@ -0,0 +1,145 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.tasks.management.commands import create_recurring_tasks
+from apps.tasks.models import Task
+
+pytestmark = pytest.mark.django_db
+
+TODAY = date(2025, 3, 15)  # a Saturday
+
+
+@pytest.fixture(autouse=True)
+def today(monkeypatch):
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return TODAY
+
+    monkeypatch.setattr(create_recurring_tasks, "date", FixedDate)
+
+
+def template(user, **fields):
+    return Task.objects.create(user=user, title="Template", is_recurring=True, **fields)
+
+
+def instances(template):
+    return Task.objects.filter(parent_task=template)
+
+
+def test_due_rules(user):
+    due = [
+        template(user, recurrence_type="daily"),
+        template(user, recurrence_type="daily", last_generated=TODAY - timedelta(1)),
+        template(user, recurrence_type="weekly", recurrence_day=TODAY.weekday()),
+        template(
+            user,
+            recurrence_type="weekly",
+            recurrence_day=TODAY.weekday(),
+            last_generated=TODAY - timedelta(7),
+        ),
+        template(
+            user,
+            recurrence_type="monthly",
+            recurrence_day=15,
+            last_generated=date(2025, 2, 15),
+        ),
+        template(
+            user,
+            recurrence_type="yearly",
+            recurrence_day=15,
+            recurrence_month=3,
+            last_generated=date(2024, 3, 15),
+        ),
+    ]
+    not_due = [
+        template(user, recurrence_type="daily", last_generated=TODAY),
+        template(user, recurrence_type="weekly", recurrence_day=TODAY.weekday() - 1),
+        template(
+            user,
+            recurrence_type="weekly",
+            recurrence_day=TODAY.weekday(),
+            last_generated=TODAY - timedelta(3),
+        ),
+        template(user, recurrence_type="monthly", recurrence_day=14),
+        template(
+            user,
+            recurrence_type="monthly",
+            recurrence_day=15,
+            last_generated=date(2025, 3, 1),
+        ),
+        template(user, recurrence_type="yearly", recurrence_day=15, recurrence_month=4),
+        template(user, recurrence_type="daily", archived=True),
+    ]
+
+    call_command("create_recurring_tasks")
+
+    for task in due:
+        assert instances(task).get().due_date == TODAY
+        task.refresh_from_db()
+        assert task.last_generated == TODAY
+    for task in not_due:
+        assert not instances(task).exists()
+
+
+def test_pending_instance_blocks_generation(user):
+    task = template(user, recurrence_type="daily")
+    Task.objects.create(user=user, title="Template", parent_task=task)
+
+    call_command("create_recurring_tasks")
+
+    assert instances(task).count() == 1
+
+
+def test_stale_instances_are_removed(user):
+    task = template(user, recurrence_type="daily", last_generated=TODAY)
+    for days in (3, 2, 1):
+        Task.objects.create(
+            user=user, parent_task=task, due_date=TODAY - timedelta(days)
+        )
+    Task.objects.create(
+        user=user, parent_task=task, status=1, due_date=TODAY - timedelta(5)
+    )
+
+    call_command("create_recurring_tasks")
+
+    assert sorted(instances(task).values_list("due_date", "status")) == [
+        (TODAY - timedelta(5), 1),
+        (TODAY - timedelta(1), 0),
+    ]
+
+
+def test_benchmark_50k_templates(user):
+    Task.objects.bulk_create(
+        [
+            Task(
+                user=user,
+                title=f"Template {i}",
+                is_recurring=True,
+                recurrence_type="daily" if i % 2 else "weekly",
+                recurrence_day=TODAY.weekday(),
+            )
+            for i in range(50_000)
+        ],
+        batch_size=5000,
+    )
+
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as context:
+        call_command("create_recurring_tasks")
+    elapsed = time.perf_counter() - start
+
+    print(f"50k templates: {elapsed:.2f}s, {len(context.captured_queries)} queries")
+    assert Task.objects.filter(is_recurring=False).count() == 50_000
+    # batched writes: a few dozen statements, not one per template
+    assert len(context.captured_queries) < 100
+
+    # a second run finds every template with a pending instance
+    with CaptureQueriesContext(connection) as context:
+        call_command("create_recurring_tasks")
+    assert Task.objects.filter(is_recurring=False).count() == 50_000
@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import cache
+
+from accounts.models import CustomUser
+from apps.weather import weather_cache
+
+pytestmark = pytest.mark.django_db()
+
+CURRENT = {
+    "coord": {"lat": 47.0, "lon": -114.0},
+    "main": {"temp": 50},
+    "sys": {"sunrise": 1700000000, "sunset": 1700030000},
+}
+FORECAST = {
+    "hourly": [{"dt": 1700000000 + 3600 * i} for i in range(24)],
+    "daily": [{"dt": 1700000000 + 86400 * i} for i in range(8)],
+}
+
+
+class Upstream:
+    """A fake OpenWeatherMap that records each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, url, **params):
+        self.calls.append((url, params))
+        if params.get("zip") == 99999:
+            return {"cod": "404", "message": "city not found"}
+        if url == weather_cache.ONECALL_URL:
+            return FORECAST
+        return CURRENT
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    cache.clear()
+    upstream = Upstream()
+    monkeypatch.setattr(weather_cache, "fetch", upstream)
+    return upstream
+
+
+def test_repeat_views_are_served_from_the_cache(client, upstream):
+    response = client.get("/weather/")
+    assert ":" in response.context["current"]["sunrise"]
+    assert len(response.context["forecast"]["hourly"]) == 12
+    assert [url for url, params in upstream.calls] == [
+        weather_cache.CURRENT_URL,
+        weather_cache.ONECALL_URL,
+    ]
+
+    for _ in range(5):
+        response = client.get("/weather/")
+    assert ":" in response.context["current"]["sunrise"]
+    assert len(response.context["forecast"]["daily"]) == 7
+    assert len(upstream.calls) == 2
+
+
+def test_users_sharing_a_zip_share_entries(client, user, upstream):
+    client.get("/weather/")
+
+    CustomUser.objects.create_user(username="Nemo", password="fish", zip=user.zip)
+    client.login(username="Nemo", password="fish")
+    client.get("/weather/")
+
+    assert len(upstream.calls) == 2
+
+
+def test_coordinates_outlive_current_conditions(client, user, upstream):
+    client.get("/weather/")
+    coords = weather_cache.get_coords(user.zip)
+    cache.delete(weather_cache._current_key(coords))
+    cache.delete(weather_cache._forecast_key(coords))
+    upstream.calls.clear()
+
+    client.get("/weather/")
+
+    assert [params for url, params in upstream.calls] == [
+        {"lat": 47.0, "lon": -114.0},
+        {"lat": 47.0, "lon": -114.0, "exclude": "minutely"},
+    ]
+
+
+def test_invalid_zip_is_remembered(client, user, upstream):
+    user.zip = 99999
+    user.save()
+
+    response = client.get("/weather/")
+    assert response.context["status"] == "invalid zip"
+    client.get("/weather/")
+
+    assert len(upstream.calls) == 1
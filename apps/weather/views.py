@@ -1,10 +1,9 @@
 from datetime import datetime
 
-import requests
-from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
 
+from apps.weather import weather_cache
 from apps.weather.timeshift import timestamp_to_eastern
 
 
@@ -20,22 +19,16 @@ def index(request):
     # if zip code is a nonzero value, fetch data
     if zip:
 
-        # fetch current weather data
-        url = "https://api.openweathermap.org/data/2.5/weather"
-        params = {
-            "zip": zip,
-            "units": "imperial",
-            "appid": settings.OPEN_WEATHER_API_KEY,
-        }
-        response = requests.get(url, params=params)
-        current = response.json()
+        # look up the location once, then share cached data by location
+        coords = weather_cache.get_coords(zip)
 
         # check for an invalid zip code
-        if "message" in current:
+        if coords is None:
             zip_valid = False
 
         # if the zip code is valid, proceed with loading data
         if zip_valid:
+            current = weather_cache.get_current(coords)
 
             # convert sunrise to Eastern time and readable string format
             sunrise = timestamp_to_eastern(current["sys"]["sunrise"])
@@ -46,13 +39,7 @@ def index(request):
             current["sunset"] = sunset.strftime("%I:%M %p")
 
             # fetch forecast data
-            url = "https://api.openweathermap.org/data/3.0/onecall"
-            params["lon"] = current["coord"]["lon"]
-            params["lat"] = current["coord"]["lat"]
-            params["exclude"] = "minutely"
-            del params["zip"]
-            response = requests.get(url, params=params)
-            forecast = response.json()
+            forecast = weather_cache.get_forecast(coords)
 
             forecast["daily"] = forecast["daily"][1:]
             forecast["hourly"] = forecast["hourly"][1:13]
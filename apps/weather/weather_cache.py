@@ -0,0 +1,124 @@
+"""Shared cache of OpenWeatherMap responses, keyed by location.
+
+A ZIP code's coordinates never change, so they are looked up once and kept
+in Django's cache without a timeout. Current conditions and the onecall
+forecast are cached per set of coordinates, for WEATHER_CURRENT_TTL and
+WEATHER_FORECAST_TTL seconds, so everyone at the same location shares one
+upstream call per window.
+"""
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+CURRENT_URL = "https://api.openweathermap.org/data/2.5/weather"
+ONECALL_URL = "https://api.openweathermap.org/data/3.0/onecall"
+
+# seconds allowed for a single request
+REQUEST_TIMEOUT = 10
+
+# seconds before a ZIP code that OpenWeatherMap didn't recognise is retried
+INVALID_ZIP_TIMEOUT = 86400
+
+
+def _coords_key(zip):
+    return f"weather:zip:{zip}"
+
+
+def _current_key(coords):
+    return "weather:current:{}:{}".format(*coords)
+
+
+def _forecast_key(coords):
+    return "weather:forecast:{}:{}".format(*coords)
+
+
+def fetch(url, **params):
+    """Fetch a response from OpenWeatherMap.
+
+    Args:
+        url (str): the endpoint
+        params: query parameters, e.g. zip, or lat and lon
+
+    Returns:
+        data (dict): the decoded response
+
+    """
+    params.update(
+        {
+            "units": "imperial",
+            "appid": settings.OPEN_WEATHER_API_KEY,
+        }
+    )
+    response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+    return response.json()
+
+
+def get_coords(zip):
+    """Get the coordinates of a ZIP code, looking it up only once.
+
+    Args:
+        zip (str): a US ZIP code
+
+    Returns:
+        coords (tuple): latitude and longitude, or None for an invalid ZIP code
+
+    Notes:
+        The lookup is a current conditions call, so its response is also
+        cached as the current conditions for those coordinates.
+
+    """
+    coords = cache.get(_coords_key(zip))
+    if coords is not None:
+        return coords or None
+
+    current = fetch(CURRENT_URL, zip=zip)
+
+    # OpenWeatherMap answers an unknown ZIP code with just a message
+    if "message" in current:
+        cache.set(_coords_key(zip), False, INVALID_ZIP_TIMEOUT)
+        return None
+
+    coords = (current["coord"]["lat"], current["coord"]["lon"])
+    cache.set(_coords_key(zip), coords, None)
+    cache.set(_current_key(coords), current, settings.WEATHER_CURRENT_TTL)
+    return coords
+
+
+def get_current(coords):
+    """Get the current conditions at a location.
+
+    Args:
+        coords (tuple): latitude and longitude, from "get_coords"
+
+    Returns:
+        current (dict): the current conditions
+
+    """
+    current = cache.get(_current_key(coords))
+    if current is None:
+        lat, lon = coords
+        current = fetch(CURRENT_URL, lat=lat, lon=lon)
+        # don't hold on to an error, e.g. a rate limit, for the whole TTL
+        if "message" not in current:
+            cache.set(_current_key(coords), current, settings.WEATHER_CURRENT_TTL)
+    return current
+
+
+def get_forecast(coords):
+    """Get the hourly and daily forecast for a location.
+
+    Args:
+        coords (tuple): latitude and longitude, from "get_coords"
+
+    Returns:
+        forecast (dict): the onecall forecast
+
+    """
+    forecast = cache.get(_forecast_key(coords))
+    if forecast is None:
+        lat, lon = coords
+        forecast = fetch(ONECALL_URL, lat=lat, lon=lon, exclude="minutely")
+        if "message" not in forecast:
+            cache.set(_forecast_key(coords), forecast, settings.WEATHER_FORECAST_TTL)
+    return forecast
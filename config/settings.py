@@ -142,6 +142,16 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use a backend shared by all gunicorn workers in production,
+# e.g. CACHE_URL=filecache:///var/tmp/django_cache or dbcache://django_cache
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -212,6 +222,21 @@ CRYPTO_API_KEY = env("CRYPTO_API_KEY")
 ALPHAVANTAGE_STOCKS_API_KEY = env("ALPHAVANGAGE_STOCKS_API_KEY")
 FINNHUB_API_KEY = env("FINNHUB_API_KEY")
 
+# Market data cache: quotes are shared by all users for MARKET_DATA_TTL
+# seconds, then served stale for up to MARKET_DATA_STALE_TTL more seconds
+# while they are refreshed in the background
+MARKET_DATA_TTL = env.int("MARKET_DATA_TTL", default=60)
+MARKET_DATA_STALE_TTL = env.int("MARKET_DATA_STALE_TTL", default=600)
+
+# Weather cache: conditions and forecasts are shared by everyone at the same
+# location, for WEATHER_CURRENT_TTL and WEATHER_FORECAST_TTL seconds
+WEATHER_CURRENT_TTL = env.int("WEATHER_CURRENT_TTL", default=600)
+WEATHER_FORECAST_TTL = env.int("WEATHER_FORECAST_TTL", default=1800)
+
+# Google Calendar: events are synced in the background once the stored
+# events are more than CALENDAR_SYNC_INTERVAL seconds old
+CALENDAR_SYNC_INTERVAL = env.int("CALENDAR_SYNC_INTERVAL", default=300)
+
 # Location Settings
 ZIP_PRIMARY = env("ZIP_PRIMARY")
 ZIP_SECONDARY = env("ZIP_SECONDARY")
@@ -210,6 +210,11 @@ urlpatterns = [
         contacts.google_toggle_htmx,
         name="contacts-google-toggle-htmx",
     ),
+    path(
+        "contacts/folder/<int:id>/google-toggle-htmx",
+        contacts.google_folder_toggle_htmx,
+        name="contacts-google-folder-toggle-htmx",
+    ),
     # notes
     path("notes/", include("apps.notes.urls")),
     # weather